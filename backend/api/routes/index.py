@@ -14,6 +14,7 @@ from backend.indexer.index_manager import index_folder, reindex_files
 from backend.db.vector_store import get_vector_store, reset_vector_store
 from backend.db.metadata_store import MetadataStore
 from backend.providers.config import _get_config_store
+from backend.providers.embedding._diskcache import get_embedding_cache
 from backend.search.bm25_index import get_bm25_index
 
 router = APIRouter()
@@ -32,6 +33,7 @@ async def clear_index():
     metadata_store.clear()
     metadata_store.clear_indexing_results()
     bm25_index.clear()
+    get_embedding_cache().clear()
 
     store = _get_config_store()
     store.delete("indexed_folder")
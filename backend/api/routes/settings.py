@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from dataclasses import replace
 from typing import Optional, List
 
 from fastapi import APIRouter, HTTPException
@@ -28,6 +29,7 @@ from backend.providers.embedding.cohere import COHERE_EMBEDDING_MODELS
 from backend.providers.embedding.voyage import VOYAGE_EMBEDDING_MODELS
 from backend.providers.reranking.cohere import COHERE_RERANK_MODELS
 from backend.indexer.embedder import reset_provider as reset_embedding_provider
+from backend.providers.embedding._diskcache import get_embedding_cache
 
 
 router = APIRouter(tags=["settings"])
@@ -111,33 +113,39 @@ async def update_settings(request: SettingsUpdateRequest):
     config = get_config()
 
     embedding_model_changed = False
+    updates = {}
 
     if request.llm_provider is not None:
-        config.llm_provider = request.llm_provider
+        updates["llm_provider"] = request.llm_provider
     if request.llm_model is not None:
-        config.llm_model = request.llm_model
+        updates["llm_model"] = request.llm_model
     if request.embedding_provider is not None:
         if config.embedding_provider != request.embedding_provider:
             embedding_model_changed = True
-        config.embedding_provider = request.embedding_provider
+        updates["embedding_provider"] = request.embedding_provider
     if request.embedding_model is not None:
         if config.embedding_model != request.embedding_model:
             embedding_model_changed = True
-        config.embedding_model = request.embedding_model
+        updates["embedding_model"] = request.embedding_model
     if request.reranking_provider is not None:
-        config.reranking_provider = request.reranking_provider
+        updates["reranking_provider"] = request.reranking_provider
     if request.reranking_model is not None:
-        config.reranking_model = request.reranking_model
+        updates["reranking_model"] = request.reranking_model
     if request.hybrid_search_enabled is not None:
-        config.hybrid_search_enabled = request.hybrid_search_enabled
+        updates["hybrid_search_enabled"] = request.hybrid_search_enabled
     if request.initial_results is not None:
-        config.initial_results = request.initial_results
+        updates["initial_results"] = request.initial_results
     if request.rerank_to is not None:
-        config.rerank_to = request.rerank_to
+        updates["rerank_to"] = request.rerank_to
+
+    config = replace(config, **updates)
 
     save_config(config)
 
     reset_embedding_provider()
+    if embedding_model_changed:
+        # The index is rebuilt with the new model, so the old model's vectors are dead weight
+        get_embedding_cache().prune(config.embedding_model)
 
     store = _get_config_store()
     indexed_folder = store.get("indexed_folder")
@@ -76,6 +76,7 @@ class SkippedFileInfo(BaseModel):
     file_name: str
     reason: str
     chunks_would_be: Optional[int] = None
+    chunk_limit: Optional[int] = None
 
 
 class SkippedByReasonInfo(BaseModel):
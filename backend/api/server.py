@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import sys
+import threading
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -51,6 +52,13 @@ app.include_router(settings_router, prefix="/api")
 app.include_router(stripe_router, prefix="/api")
 
 
+@app.on_event("startup")
+def warmup_providers_in_background() -> None:
+    """Load provider SDKs off the request path without delaying startup."""
+    from backend.providers.factory import warmup_providers
+    threading.Thread(target=warmup_providers, name="provider-warmup", daemon=True).start()
+
+
 @app.get("/")
 async def root():
     return {"message": "Docora API", "version": "1.0.0"}
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 import re
 from pathlib import Path
 from typing import Optional, List, Dict, Generator, Tuple, Union
@@ -236,6 +237,12 @@ def _normalize_for_matching(text: str) -> str:
     return text.lower().replace(" ", "").replace("-", "").replace("_", "")
 
 
+@functools.lru_cache(maxsize=16384)
+def _normalized_path_parts(file_path: str) -> Tuple[str, ...]:
+    """Normalized components of an indexed path, cached across queries."""
+    return tuple(_normalize_for_matching(part) for part in Path(file_path).parts)
+
+
 def resolve_folder_to_file_paths(
     folder_name: str,
     vector_store: Optional[VectorStore] = None,
@@ -258,9 +265,7 @@ def resolve_folder_to_file_paths(
 
     matching_files = []
     for file_path in all_files:
-        path_parts = Path(file_path).parts
-        for part in path_parts:
-            part_normalized = _normalize_for_matching(part)
+        for part_normalized in _normalized_path_parts(file_path):
             if folder_normalized in part_normalized or part_normalized in folder_normalized:
                 matching_files.append(file_path)
                 break
@@ -5,6 +5,7 @@ import json
 import os
 import sqlite3
 import sys
+import threading
 from pathlib import Path
 from typing import Optional, Dict, List
 
@@ -26,7 +27,13 @@ DEFAULT_DB_PATH = str(get_data_dir() / "metadata.db")
 
 
 class MetadataStore:
-    """SQLite store for tracking indexed files and their hashes."""
+    """
+    SQLite store for tracking indexed files and their hashes.
+
+    Each thread gets its own connection to the WAL-mode database, so readers
+    never wait on each other or on a writer. This relies on the sqlite3
+    module being built thread-safe, which is the default.
+    """
 
     def __init__(self, db_path: str = None):
         if db_path is None:
@@ -34,15 +41,36 @@ class MetadataStore:
         db_file = Path(db_path)
         db_file.parent.mkdir(parents=True, exist_ok=True)
 
-        self.conn = sqlite3.connect(
-            db_path,
+        self._db_path = db_path
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._init_tables()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Connection for the calling thread, opened on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+        return conn
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self._db_path,
             check_same_thread=False,
             timeout=30.0,
             isolation_level=None  # Autocommit mode - prevents nested transaction issues
         )
-        self.conn.row_factory = sqlite3.Row
-        self.conn.execute("PRAGMA journal_mode=WAL")
-        self._init_tables()
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")
+        with self._connections_lock:
+            self._connections.append(conn)
+        return conn
 
     def _init_tables(self) -> None:
         cursor = self.conn.cursor()
@@ -76,7 +104,8 @@ class MetadataStore:
                 file_name TEXT,
                 reason TEXT,
                 chunks_would_be INTEGER,
-                category TEXT
+                category TEXT,
+                chunk_limit INTEGER
             )
         """)
         cursor.execute("""
@@ -107,11 +136,13 @@ class MetadataStore:
         self.conn.commit()
 
     def _migrate_skipped_files_table(self, cursor) -> None:
-        """Add file_path column to skipped_files if it doesn't exist."""
+        """Add file_path and chunk_limit columns to skipped_files if they don't exist."""
         cursor.execute("PRAGMA table_info(skipped_files)")
         columns = [row[1] for row in cursor.fetchall()]
         if "file_path" not in columns:
             cursor.execute("ALTER TABLE skipped_files ADD COLUMN file_path TEXT")
+        if "chunk_limit" not in columns:
+            cursor.execute("ALTER TABLE skipped_files ADD COLUMN chunk_limit INTEGER")
 
     def _migrate_indexed_files_table(self, cursor) -> None:
         """Add archived_at column to indexed_files if it doesn't exist."""
@@ -160,6 +191,12 @@ class MetadataStore:
             cursor.execute("SELECT * FROM indexed_files WHERE archived_at IS NULL")
         return [dict(row) for row in cursor.fetchall()]
 
+    def get_file_chunk_counts(self) -> List[tuple]:
+        """Get (file_path, chunk_count) for all non-archived indexed files."""
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT file_path, chunk_count FROM indexed_files WHERE archived_at IS NULL")
+        return cursor.fetchall()
+
     def get_active_file_count(self) -> int:
         """Get count of non-archived indexed files."""
         cursor = self.conn.cursor()
@@ -189,6 +226,10 @@ class MetadataStore:
             file_paths,
         )
         self.conn.commit()
+        if cursor.rowcount:
+            # Searches skip archived files, so cached results are now stale
+            from backend.providers.semantic_cache import invalidate_semantic_cache
+            invalidate_semantic_cache()
         return cursor.rowcount
 
     def restore_archived_files(self) -> int:
@@ -196,6 +237,10 @@ class MetadataStore:
         cursor = self.conn.cursor()
         cursor.execute("UPDATE indexed_files SET archived_at = NULL WHERE archived_at IS NOT NULL")
         self.conn.commit()
+        if cursor.rowcount:
+            # Searches skip archived files, so cached results are now stale
+            from backend.providers.semantic_cache import invalidate_semantic_cache
+            invalidate_semantic_cache()
         return cursor.rowcount
 
     def get_oldest_files(self, count: int) -> List[str]:
@@ -260,13 +305,14 @@ class MetadataStore:
         for category, files in skipped_by_reason.items():
             for f in files:
                 cursor.execute("""
-                    INSERT INTO skipped_files (file_path, file_name, reason, chunks_would_be, category)
-                    VALUES (?, ?, ?, ?, ?)
+                    INSERT INTO skipped_files (file_path, file_name, reason, chunks_would_be, chunk_limit, category)
+                    VALUES (?, ?, ?, ?, ?, ?)
                 """, (
                     f.get("file_path"),
                     f.get("file_name"),
                     f.get("reason"),
                     f.get("chunks_would_be"),
+                    f.get("chunk_limit"),
                     category,
                 ))
 
@@ -301,6 +347,8 @@ class MetadataStore:
                 entry["file_path"] = sf["file_path"]
             if sf["chunks_would_be"] is not None:
                 entry["chunks_would_be"] = sf["chunks_would_be"]
+            if sf["chunk_limit"] is not None:
+                entry["chunk_limit"] = sf["chunk_limit"]
 
             category = sf["category"]
             if category in skipped_by_reason:
@@ -428,8 +476,12 @@ class MetadataStore:
         self.conn.commit()
 
     def close(self) -> None:
-        """Close the database connection."""
-        self.conn.close()
+        """Close the database connections opened by every thread."""
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
 
 
 def compute_file_hash(file_path: str) -> str:
@@ -2,13 +2,40 @@ from __future__ import annotations
 
 import shutil
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 
 import chromadb
+import numpy as np
 from chromadb.config import Settings
 
+# Chroma's HNSW index over cosine distance. HNSW parameters only take effect
+# when the collection is created, so existing collections keep theirs until
+# the next reset. search_ef above the default of 10 keeps recall high for the
+# larger candidate pools hybrid search asks for.
+COLLECTION_METADATA = {
+    "hnsw:space": "cosine",
+    "hnsw:M": 32,
+    "hnsw:construction_ef": 200,
+    "hnsw:search_ef": 64,
+}
+
 _vector_store_instance: Optional["VectorStore"] = None
 
+# Bumped whenever any instance changes which chunks are stored (the indexer
+# writes through its own instance), so cached file lists know they are stale
+_files_version = 0
+
+
+def _bump_files_version() -> None:
+    global _files_version
+    _files_version += 1
+
+
+def _invalidate_search_caches() -> None:
+    """Drop cached search results after the stored chunks change."""
+    from backend.providers.semantic_cache import invalidate_semantic_cache
+    invalidate_semantic_cache()
+
 
 def get_vector_store() -> "VectorStore":
     """Get or create a singleton VectorStore instance."""
@@ -36,6 +63,8 @@ class VectorStore:
             persist_dir = str(get_data_dir() / "chroma_db")
         self._persist_path = Path(persist_dir)
         self._persist_path.mkdir(parents=True, exist_ok=True)
+        # (files version, file paths) from the last get_indexed_files call
+        self._indexed_files: Optional[Tuple[int, List[str]]] = None
 
         self._init_client_with_recovery(expected_dimension, auto_reset)
 
@@ -70,10 +99,15 @@ class VectorStore:
         if expected_dimension is not None:
             self._check_and_reset_for_dimension(expected_dimension)
 
-        self.collection = self.client.get_or_create_collection(
-            name="documents",
-            metadata={"hnsw:space": "cosine"}
-        )
+        try:
+            self.collection = self.client.get_collection("documents")
+        except Exception:
+            self.collection = self.client.create_collection(
+                name="documents",
+                metadata=COLLECTION_METADATA
+            )
+        # A dimension reset or corruption recovery may have dropped chunks
+        _bump_files_version()
 
     def _reset_corrupted_database(self) -> None:
         """Delete and recreate corrupted ChromaDB database directory."""
@@ -104,22 +138,24 @@ class VectorStore:
             pass
         self.collection = self.client.create_collection(
             name="documents",
-            metadata={"hnsw:space": "cosine"}
+            metadata=COLLECTION_METADATA
         )
+        _bump_files_version()
+        _invalidate_search_caches()
 
     def add_chunks(
         self,
         chunks: List[Dict],
-        embeddings: List[List[float]]
+        embeddings: np.ndarray
     ) -> None:
         """
         Add chunks with their embeddings to the vector store.
 
         Args:
             chunks: List of chunk dicts with text, file_path, slide_number, chunk_index
-            embeddings: List of embedding vectors
+            embeddings: (N, D) float32 array, one row per chunk
         """
-        if not chunks or not embeddings:
+        if not chunks or len(embeddings) == 0:
             return
 
         ids = []
@@ -142,6 +178,8 @@ class VectorStore:
             embeddings=embeddings,
             metadatas=metadatas
         )
+        _bump_files_version()
+        _invalidate_search_caches()
 
     def search(
         self,
@@ -258,9 +296,20 @@ class VectorStore:
 
         if results["ids"]:
             self.collection.delete(ids=results["ids"])
+            _bump_files_version()
+            _invalidate_search_caches()
 
     def get_indexed_files(self) -> List[str]:
-        """Get list of all unique file paths in the index."""
+        """
+        Get list of all unique file paths in the index.
+
+        Reading every chunk's metadata is O(chunks), so the result is cached
+        until the next add, delete or reset in this process.
+        """
+        version = _files_version
+        if self._indexed_files is not None and self._indexed_files[0] == version:
+            return list(self._indexed_files[1])
+
         results = self.collection.get(include=["metadatas"])
 
         file_paths = set()
@@ -269,7 +318,9 @@ class VectorStore:
                 if metadata and "file_path" in metadata:
                     file_paths.add(metadata["file_path"])
 
-        return list(file_paths)
+        files = list(file_paths)
+        self._indexed_files = (version, files)
+        return list(files)
 
     def count(self) -> int:
         """Return the total number of chunks in the collection."""
@@ -318,43 +369,44 @@ class VectorStore:
 
         return search_results[:limit]
 
-    def get_chunks_by_file_and_page(
+    def get_chunks_by_files_and_pages(
         self,
-        file_path: str,
-        page_number: int
-    ) -> List[Dict]:
+        pages: List[Tuple[str, int]],
+    ) -> Dict[Tuple[str, int], List[Dict]]:
         """
-        Get all chunks from a specific file and page/slide number.
+        Get all chunks from many file pages/slides in one query.
 
         Args:
-            file_path: Path to the file
-            page_number: Page or slide number
+            pages: (file_path, page_number) pairs
 
         Returns:
-            List of chunks with text and metadata
+            Chunks keyed by (file_path, page_number); pages with no chunks are absent
         """
+        if not pages:
+            return {}
+
+        clauses = [
+            {"$and": [{"file_path": file_path}, {"slide_number": page_number}]}
+            for file_path, page_number in pages
+        ]
         results = self.collection.get(
-            where={
-                "$and": [
-                    {"file_path": file_path},
-                    {"slide_number": page_number}
-                ]
-            },
+            where=clauses[0] if len(clauses) == 1 else {"$or": clauses},
             include=["documents", "metadatas"]
         )
 
-        chunks = []
-        if results["ids"]:
-            for i, doc_id in enumerate(results["ids"]):
-                chunks.append({
-                    "id": doc_id,
-                    "text": results["documents"][i],
-                    "metadata": results["metadatas"][i],
-                    "file_path": file_path,
-                    "file_name": Path(file_path).name,
-                    "slide_number": page_number,
-                    "relevance_score": 1.0
-                })
+        chunks: Dict[Tuple[str, int], List[Dict]] = {}
+        for doc_id, text, metadata in zip(results["ids"], results["documents"], results["metadatas"]):
+            file_path = metadata["file_path"]
+            page_number = metadata["slide_number"]
+            chunks.setdefault((file_path, page_number), []).append({
+                "id": doc_id,
+                "text": text,
+                "metadata": metadata,
+                "file_path": file_path,
+                "file_name": Path(file_path).name,
+                "slide_number": page_number,
+                "relevance_score": 1.0
+            })
 
         return chunks
 
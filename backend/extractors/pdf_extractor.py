@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import List, Dict, Union, TypedDict
+from typing import Dict, Iterator, List, Union, TypedDict
 
 
 from pypdf import PdfReader
@@ -12,39 +12,44 @@ class ExtractionResult(TypedDict):
     skip_reason: str | None
 
 
-def extract_text_from_pdf(file_path: Union[str, Path]) -> ExtractionResult:
+def iter_text_from_pdf(file_path: Union[str, Path]) -> Iterator[Dict]:
     """
-    Extract text from a PDF file.
+    Lazily extract text from a PDF, one page at a time.
 
-    Returns a dict with:
-    - content: list of page dicts [{"page_number": 1, "text": "..."}, ...]
-    - skip_reason: None if successful, or a reason string if skipped
+    Yields page dicts {"page_number": 1, "text": "..."} for pages with text,
+    so callers can stop reading a large document early.
     """
-    file_path = Path(file_path)
-    reader = PdfReader(file_path)
-
-    if len(reader.pages) == 0:
-        return {"content": [], "skip_reason": "empty file"}
-
-    pages_content = []
-    pages_with_images = 0
+    reader = PdfReader(Path(file_path))
 
     for page_index, page in enumerate(reader.pages, start=1):
         page_text = page.extract_text()
-
-        if page.images:
-            pages_with_images += 1
-
         if page_text and page_text.strip():
-            pages_content.append({
+            yield {
                 "page_number": page_index,
                 "text": page_text.strip()
-            })
+            }
+
+
+def pdf_skip_reason(file_path: Union[str, Path]) -> str:
+    """Explain why a PDF yielded no text: "scanned image" or "empty file"."""
+    reader = PdfReader(Path(file_path))
+    if any(page.images for page in reader.pages):
+        return "scanned image"
+    return "empty file"
+
+
+def extract_text_from_pdf(file_path: Union[str, Path]) -> ExtractionResult:
+    """
+    Extract text from a PDF file.
+
+    Returns a dict with:
+    - content: list of page dicts [{"page_number": 1, "text": "..."}, ...]
+    - skip_reason: None if successful, or a reason string if skipped
+    """
+    pages_content = list(iter_text_from_pdf(file_path))
 
     if not pages_content:
-        if pages_with_images > 0:
-            return {"content": [], "skip_reason": "scanned image"}
-        return {"content": [], "skip_reason": "empty file"}
+        return {"content": [], "skip_reason": pdf_skip_reason(file_path)}
 
     return {"content": pages_content, "skip_reason": None}
 
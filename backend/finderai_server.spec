@@ -86,7 +86,6 @@ hiddenimports = [
     "keyring",
     "keyring.backends",
     "dotenv",
-    "rank_bm25",
     "httpx",
     "httpcore",
     "anyio",
@@ -126,6 +125,8 @@ hiddenimports = [
 
 # Add all submodules for complex packages
 hiddenimports += collect_submodules("chromadb")
+# Provider packages import their exports lazily, so list them explicitly
+hiddenimports += collect_submodules("backend.providers")
 hiddenimports += collect_submodules("pydantic")
 hiddenimports += collect_submodules("starlette")
 hiddenimports += collect_submodules("onnxruntime")
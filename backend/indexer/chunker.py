@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import os
 import re
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 
 CHUNK_SIZE_DEFAULT = 800
@@ -29,16 +30,21 @@ def normalize_text(text: str) -> str:
     return text
 
 
+CHUNK_PARAMS_BY_EXT = {
+    ".pdf": (CHUNK_SIZE_PDF, CHUNK_OVERLAP_PDF),
+    ".docx": (CHUNK_SIZE_DOCX, CHUNK_OVERLAP_DOCX),
+    ".xlsx": (CHUNK_SIZE_XLSX, CHUNK_OVERLAP_XLSX),
+}
+
+
+def get_chunk_params_for_ext(ext: str) -> Tuple[int, int]:
+    """Return (chunk_size, chunk_overlap) for a lowercase file extension."""
+    return CHUNK_PARAMS_BY_EXT.get(ext, (CHUNK_SIZE_DEFAULT, CHUNK_OVERLAP_DEFAULT))
+
+
 def get_chunk_params(file_path: str) -> Tuple[int, int]:
     """Return (chunk_size, chunk_overlap) based on file type."""
-    lower_path = file_path.lower()
-    if lower_path.endswith('.pdf'):
-        return CHUNK_SIZE_PDF, CHUNK_OVERLAP_PDF
-    if lower_path.endswith('.docx'):
-        return CHUNK_SIZE_DOCX, CHUNK_OVERLAP_DOCX
-    if lower_path.endswith('.xlsx'):
-        return CHUNK_SIZE_XLSX, CHUNK_OVERLAP_XLSX
-    return CHUNK_SIZE_DEFAULT, CHUNK_OVERLAP_DEFAULT
+    return get_chunk_params_for_ext(os.path.splitext(file_path)[1].lower())
 
 
 def chunk_text(
@@ -108,19 +114,22 @@ def chunk_text(
 
 
 def chunk_document(
-    content: List[Dict],
+    content: Iterable[Dict],
     file_path: str,
     chunk_size: int = CHUNK_SIZE,
-    chunk_overlap: int = CHUNK_OVERLAP
+    chunk_overlap: int = CHUNK_OVERLAP,
+    max_chunks: Optional[int] = None
 ) -> List[Dict]:
     """
     Chunk an entire document (list of pages/slides) into chunks.
 
     Args:
-        content: List of dicts with 'text' and either 'slide_number' or 'page_number'
+        content: Iterable of dicts with 'text' and either 'slide_number' or 'page_number'
         file_path: Path to the source file
         chunk_size: Maximum words per chunk
         chunk_overlap: Words to overlap between chunks
+        max_chunks: If set, stop consuming content once this many chunks are
+            exceeded and return the first max_chunks + 1 chunks
 
     Returns:
         List of chunk dicts with metadata
@@ -137,5 +146,7 @@ def chunk_document(
             chunk_overlap=chunk_overlap
         )
         all_chunks.extend(item_chunks)
+        if max_chunks is not None and len(all_chunks) > max_chunks:
+            return all_chunks[:max_chunks + 1]
 
     return all_chunks
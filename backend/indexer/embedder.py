@@ -2,12 +2,21 @@
 
 from __future__ import annotations
 
+import threading
 from typing import List, Optional
 
+import numpy as np
+
 from backend.providers import get_embedding_provider, get_config
 from backend.providers.embedding.base import BaseEmbeddingProvider
 
 
+# Embed calls in flight across all indexing workers: the old fixed worker count.
+# A file's chunks usually fit in one provider request, so this is roughly the
+# number of concurrent API requests, however many CPUs extract in parallel
+EMBED_CONCURRENCY = 3
+_embed_slots = threading.BoundedSemaphore(EMBED_CONCURRENCY)
+
 _embedding_provider: Optional[BaseEmbeddingProvider] = None
 
 
@@ -37,12 +46,26 @@ def generate_embedding(text: str) -> List[float]:
     return provider.embed_query(text)
 
 
-def generate_embeddings(texts: List[str]) -> List[List[float]]:
-    """Generate embeddings for multiple texts."""
+def generate_embeddings(
+    texts: List[str],
+    provider: Optional[BaseEmbeddingProvider] = None,
+) -> np.ndarray:
+    """
+    Generate embeddings for multiple texts.
+
+    Returns a single C-contiguous float32 array of shape (len(texts), dimension)
+    so the whole batch can be handed to the vector store as one buffer.
+    Pass `provider` to reuse an already-initialized provider across calls.
+    Calls from concurrent indexing workers are limited to EMBED_CONCURRENCY
+    at a time; extraction and chunking still run in parallel.
+    """
     if not texts:
-        return []
-    provider = get_provider()
-    return provider.embed(texts)
+        return np.empty((0, 0), dtype=np.float32)
+    if provider is None:
+        provider = get_provider()
+    with _embed_slots:
+        embeddings = provider.embed(texts)
+    return np.asarray(embeddings, dtype=np.float32, order="C")
 
 
 def get_embedding_dimension() -> int:
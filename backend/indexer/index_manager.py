@@ -8,11 +8,12 @@ from pathlib import Path
 from typing import List, Callable, Optional, Set
 
 from backend.extractors.pptx_extractor import extract_text_from_pptx
-from backend.extractors.pdf_extractor import extract_text_from_pdf
+from backend.extractors.pdf_extractor import extract_text_from_pdf, iter_text_from_pdf, pdf_skip_reason
 from backend.extractors.docx_extractor import extract_text_from_docx
 from backend.extractors.xlsx_extractor import extract_text_from_xlsx
-from backend.indexer.chunker import chunk_document, get_chunk_params
-from backend.indexer.embedder import generate_embeddings, get_embedding_dimension
+from backend.indexer.chunker import chunk_document, get_chunk_params_for_ext
+from backend.indexer.embedder import generate_embeddings, get_embedding_dimension, get_provider
+from backend.providers.embedding.base import BaseEmbeddingProvider
 from backend.db.vector_store import VectorStore
 from backend.db.metadata_store import MetadataStore, compute_file_hash
 from backend.search.bm25_index import get_bm25_index
@@ -24,7 +25,6 @@ SUPPORTED_EXTENSIONS = {".pptx", ".pdf", ".docx", ".xlsx"}
 
 MAX_CHUNKS_PER_FILE = 50
 MAX_FILE_SIZE_MB = 50
-PARALLEL_WORKERS = 3
 
 EXTRACTORS = {
     ".pptx": extract_text_from_pptx,
@@ -33,6 +33,24 @@ EXTRACTORS = {
     ".xlsx": extract_text_from_xlsx,
 }
 
+UNIT_NAMES = {".pdf": "pages", ".pptx": "slides", ".docx": "sections", ".xlsx": "sheets"}
+
+# PDFs are extracted lazily so the chunk limit can stop reading early.
+STREAMING_EXTRACTORS = {
+    ".pdf": iter_text_from_pdf,
+}
+
+# ext -> (extractor, unit_name, chunk_size, chunk_overlap, is_pdf)
+EXT_TABLE = {
+    ext: (
+        STREAMING_EXTRACTORS.get(ext, EXTRACTORS[ext]),
+        UNIT_NAMES[ext],
+        *get_chunk_params_for_ext(ext),
+        ext == ".pdf",
+    )
+    for ext in SUPPORTED_EXTENSIONS
+}
+
 
 def _categorize_skip_reason(skip_reason: str) -> str:
     """Map a skip reason string to a category key."""
@@ -49,6 +67,109 @@ def _categorize_skip_reason(skip_reason: str) -> str:
     return "empty_file"
 
 
+class _ProgressBatcher:
+    """Coalesce progress messages into at most one callback per interval."""
+
+    def __init__(
+        self,
+        callback: Callable[[str], None],
+        min_interval: float = 0.25,
+        max_pending: int = 16,
+    ):
+        self._callback = callback
+        self._min_interval = min_interval
+        self._max_pending = max_pending
+        self._pending: List[str] = []
+        self._last_emit = 0.0
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    def __call__(self, msg: str) -> None:
+        with self._lock:
+            self._pending.append(msg)
+            if (
+                time.monotonic() - self._last_emit >= self._min_interval
+                or len(self._pending) >= self._max_pending
+            ):
+                self._emit()
+            elif self._timer is None:
+                self._timer = threading.Timer(self._min_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        """Deliver any buffered messages immediately."""
+        with self._lock:
+            self._emit()
+
+    def _emit(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._pending:
+            self._callback("\n".join(self._pending))
+            self._pending.clear()
+        self._last_emit = time.monotonic()
+
+
+class _JobHeartbeat:
+    """Persist indexing job progress from a background thread at a fixed interval."""
+
+    def __init__(
+        self,
+        metadata_store: MetadataStore,
+        job_id: int,
+        get_count: Callable[[], int],
+        interval: float = 2.0,
+    ):
+        self._metadata_store = metadata_store
+        self._job_id = job_id
+        self._get_count = get_count
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        last_count = None
+        while not self._stop.wait(self._interval):
+            count = self._get_count()
+            if count != last_count:
+                self._metadata_store.update_indexing_job_progress(self._job_id, count)
+                last_count = count
+
+
+def _default_workers() -> int:
+    """
+    Number of indexing workers: the CPUs available to this process, minus one.
+
+    Workers extract and chunk in parallel; generate_embeddings caps their
+    concurrent embedding calls, so this does not multiply API load.
+    """
+    try:
+        available = len(os.sched_getaffinity(0))
+    except AttributeError:
+        available = os.cpu_count() or 2
+    return max(1, available - 1)
+
+
+def _largest_first(files: List[str]) -> List[str]:
+    """Order files by size descending so the slowest files start first."""
+    def size(file_path: str) -> int:
+        try:
+            return os.path.getsize(file_path)
+        except OSError:
+            return 0
+
+    return sorted(files, key=size, reverse=True)
+
+
 def scan_folder(
     folder_path: str,
     extensions: Optional[Set[str]] = None,
@@ -99,10 +220,13 @@ def index_file(
     }
 
     start_total = time.time()
-    file_ext = Path(file_path).suffix.lower()
-    file_size_mb = Path(file_path).stat().st_size / (1024 * 1024)
+    path = Path(file_path)
+    file_name = path.name
+    file_ext = path.suffix.lower()
+    file_size_mb = path.stat().st_size / (1024 * 1024)
 
-    if file_ext not in EXTRACTORS:
+    entry = EXT_TABLE.get(file_ext)
+    if entry is None:
         if progress_callback:
             progress_callback(f"  Unsupported file type: {file_ext}")
         result["skipped"] = True
@@ -117,25 +241,25 @@ def index_file(
         return result
 
     if progress_callback:
-        progress_callback(f"Extracting text from {Path(file_path).name} ({file_size_mb:.2f}MB)...")
+        progress_callback(f"Extracting text from {file_name} ({file_size_mb:.2f}MB)...")
+
+    extractor, unit_name, chunk_size, chunk_overlap, is_pdf = entry
 
     start_extract = time.time()
-    extractor = EXTRACTORS[file_ext]
     content = extractor(file_path)
+    if is_pdf:
+        content = list(content)
     result["extract_time"] = time.time() - start_extract
 
     if not content:
         if progress_callback:
-            progress_callback(f"  No text found in {Path(file_path).name}")
+            progress_callback(f"  No text found in {file_name}")
         result["total_time"] = time.time() - start_total
         return result
 
-    unit_names = {".pdf": "pages", ".pptx": "slides", ".docx": "sections", ".xlsx": "sheets"}
-    unit_name = unit_names.get(file_ext, "sections")
     if progress_callback:
         progress_callback(f"  Found {len(content)} {unit_name} with text (extract: {result['extract_time']:.1f}s)")
 
-    chunk_size, chunk_overlap = get_chunk_params(file_path)
     chunks = chunk_document(content, file_path, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
 
     if not chunks:
@@ -187,16 +311,18 @@ def _process_single_file(
     db_lock: threading.Lock,
     force_reindex: bool = False,
     max_chunks_per_file: int = MAX_CHUNKS_PER_FILE,
-    max_file_size_mb: int = MAX_FILE_SIZE_MB
+    max_file_size_mb: int = MAX_FILE_SIZE_MB,
+    embedding_provider: Optional[BaseEmbeddingProvider] = None,
 ) -> dict:
     """
     Process a single file for indexing (thread-safe).
 
     Returns dict with result info for aggregation.
     """
+    path = Path(file_path)
     result = {
         "file_path": file_path,
-        "file_name": Path(file_path).name,
+        "file_name": path.name,
         "action": None,
         "chunks": 0,
         "skipped": False,
@@ -213,8 +339,7 @@ def _process_single_file(
     try:
         current_hash = compute_file_hash(file_path)
 
-        with db_lock:
-            stored_hash = metadata_store.get_file_hash(file_path)
+        stored_hash = metadata_store.get_file_hash(file_path)
 
         if not force_reindex and stored_hash == current_hash:
             result["action"] = "skipped_unchanged"
@@ -228,10 +353,11 @@ def _process_single_file(
         else:
             result["action"] = "index"
 
-        file_ext = Path(file_path).suffix.lower()
-        file_size_mb = Path(file_path).stat().st_size / (1024 * 1024)
+        file_ext = path.suffix.lower()
+        file_size_mb = path.stat().st_size / (1024 * 1024)
 
-        if file_ext not in EXTRACTORS:
+        entry = EXT_TABLE.get(file_ext)
+        if entry is None:
             result["skipped"] = True
             result["skip_reason"] = f"unsupported type: {file_ext}"
             result["total_time"] = time.time() - start_total
@@ -243,43 +369,45 @@ def _process_single_file(
             result["total_time"] = time.time() - start_total
             return result
 
-        start_extract = time.time()
-        extractor = EXTRACTORS[file_ext]
-        extraction_result = extractor(file_path)
-        result["extract_time"] = time.time() - start_extract
+        extractor, _, chunk_size, chunk_overlap, is_pdf = entry
 
-        if file_ext == ".pdf" and isinstance(extraction_result, dict):
-            content = extraction_result.get("content", [])
-            skip_reason = extraction_result.get("skip_reason")
-        else:
-            content = extraction_result
-            skip_reason = None
+        start_extract = time.time()
+        content = extractor(file_path)
 
-        if not content:
+        if not is_pdf and not content:
             result["skipped"] = True
-            result["skip_reason"] = skip_reason or "no extractable content"
+            result["skip_reason"] = "no extractable content"
+            result["extract_time"] = time.time() - start_extract
             result["total_time"] = time.time() - start_total
             return result
 
-        chunk_size, chunk_overlap = get_chunk_params(file_path)
-        chunks = chunk_document(content, file_path, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        # PDF pages are pulled lazily; extraction stops once the limit is exceeded
+        chunks = chunk_document(
+            content,
+            file_path,
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            max_chunks=max_chunks_per_file,
+        )
+        result["extract_time"] = time.time() - start_extract
 
         if not chunks:
             result["skipped"] = True
-            result["skip_reason"] = "no chunks generated"
+            result["skip_reason"] = pdf_skip_reason(file_path) if is_pdf else "no chunks generated"
             result["total_time"] = time.time() - start_total
             return result
 
+        # Chunking stopped at the first chunk past the limit, so the full count is unknown
         if len(chunks) > max_chunks_per_file:
             result["skipped"] = True
-            result["skip_reason"] = f"too many chunks: {len(chunks)} > {max_chunks_per_file}"
-            result["chunks_would_be"] = len(chunks)
+            result["skip_reason"] = f"too many chunks: more than {max_chunks_per_file}"
+            result["chunk_limit"] = max_chunks_per_file
             result["total_time"] = time.time() - start_total
             return result
 
         start_embed = time.time()
         texts = [c["text"] for c in chunks]
-        embeddings = generate_embeddings(texts)
+        embeddings = generate_embeddings(texts, provider=embedding_provider)
         result["embed_time"] = time.time() - start_embed
 
         start_store = time.time()
@@ -304,13 +432,188 @@ def _process_single_file(
     return result
 
 
+def _empty_stats(total_files: int) -> dict:
+    """Create a fresh indexing statistics dict."""
+    return {
+        "total_files": total_files,
+        "indexed_files": 0,
+        "skipped_unchanged": 0,
+        "skipped_limits": 0,
+        "total_chunks": 0,
+        "total_time": 0.0,
+        "total_embed_time": 0.0,
+        "file_times": [],
+        "errors": [],
+        "skipped_files": [],
+        "skipped_by_reason": {
+            "scanned_image": [],
+            "empty_file": [],
+            "file_too_large": [],
+            "unsupported_type": [],
+            "chunk_limit_exceeded": [],
+        },
+        "cancelled": False
+    }
+
+
+def _run_indexing(
+    files: List[str],
+    *,
+    vector_store: VectorStore,
+    metadata_store: MetadataStore,
+    force_reindex: bool,
+    parallel_workers: int,
+    max_chunks_per_file: int,
+    max_file_size_mb: int,
+    cancel_event: Optional[threading.Event],
+    job_id: Optional[int],
+    progress_callback: Optional[Callable[[str], None]],
+    action_label: str = "Indexed",
+) -> dict:
+    """
+    Process files on a worker pool and aggregate their results.
+
+    When job_id is given, per-file status and job progress are persisted and
+    a cancellation pauses the job so it can be resumed later.
+
+    Args:
+        files: File paths to process
+        vector_store: VectorStore instance
+        metadata_store: MetadataStore instance
+        force_reindex: If True, reindex files even if unchanged
+        parallel_workers: Number of parallel workers
+        max_chunks_per_file: Max chunks per file before skipping
+        max_file_size_mb: Max file size in MB before skipping
+        cancel_event: Optional threading.Event to signal cancellation
+        job_id: Optional indexing job ID to record progress against
+        progress_callback: Optional callback for progress updates
+        action_label: Verb used in per-file progress messages
+
+    Returns:
+        Dict with indexing statistics
+    """
+    stats = _empty_stats(len(files))
+    folder_start = time.time()
+    db_lock = threading.Lock()
+    completed_count = 0
+    embedding_provider = get_provider()
+
+    heartbeat = None
+    if job_id is not None:
+        heartbeat = _JobHeartbeat(metadata_store, job_id, lambda: completed_count)
+        heartbeat.start()
+
+    try:
+        with ThreadPoolExecutor(max_workers=parallel_workers) as executor:
+            futures: dict[Future, str] = {}
+            for file_path in _largest_first(files):
+                if cancel_event and cancel_event.is_set():
+                    break
+                futures[executor.submit(
+                    _process_single_file,
+                    file_path,
+                    vector_store,
+                    metadata_store,
+                    db_lock,
+                    force_reindex,
+                    max_chunks_per_file,
+                    max_file_size_mb,
+                    embedding_provider,
+                )] = file_path
+
+            for future in as_completed(futures):
+                if cancel_event and cancel_event.is_set():
+                    stats["cancelled"] = True
+                    if job_id is not None:
+                        stats["paused"] = True
+                    if progress_callback:
+                        progress_callback("Indexing paused" if job_id is not None else "Reindexing cancelled by user")
+                    executor.shutdown(wait=True, cancel_futures=False)
+                    if job_id is not None:
+                        metadata_store.update_job_status(job_id, "paused")
+                        metadata_store.update_indexing_job_progress(job_id, completed_count)
+                    break
+
+                completed_count += 1
+                result = future.result()
+                file_path = result["file_path"]
+
+                if job_id is not None:
+                    file_status = "completed" if not result.get("error") else "error"
+                    if result.get("skipped"):
+                        file_status = "skipped"
+                    metadata_store.update_job_file_status(job_id, file_path, file_status)
+
+                if result["action"] == "skipped_unchanged":
+                    stats["skipped_unchanged"] += 1
+                    if progress_callback:
+                        progress_callback(f"[{completed_count}/{len(files)}] Skipped (unchanged): {result['file_name']}")
+                elif result["error"]:
+                    stats["errors"].append(f"Error indexing {result['file_path']}: {result['error']}")
+                    if progress_callback:
+                        progress_callback(f"[{completed_count}/{len(files)}] ERROR: {result['file_name']} - {result['error']}")
+                elif result["skipped"]:
+                    stats["skipped_limits"] += 1
+                    stats["file_times"].append({
+                        "file": result["file_name"],
+                        "skipped": True,
+                        "reason": result["skip_reason"]
+                    })
+
+                    skip_reason = result["skip_reason"]
+                    category = _categorize_skip_reason(skip_reason)
+                    skipped_entry = {
+                        "file_path": result["file_path"],
+                        "file_name": result["file_name"],
+                        "reason": skip_reason,
+                    }
+                    if result.get("chunk_limit"):
+                        skipped_entry["chunk_limit"] = result["chunk_limit"]
+
+                    stats["skipped_by_reason"][category].append(skipped_entry)
+
+                    if category == "chunk_limit_exceeded":
+                        stats["skipped_files"].append(skipped_entry)
+
+                    if progress_callback:
+                        progress_callback(f"[{completed_count}/{len(files)}] Skipped ({skip_reason}): {result['file_name']}")
+                else:
+                    stats["indexed_files"] += 1
+                    stats["total_chunks"] += result["chunks"]
+                    stats["total_embed_time"] += result["embed_time"]
+                    stats["file_times"].append({
+                        "file": result["file_name"],
+                        "chunks": result["chunks"],
+                        "total_time": result["total_time"],
+                        "embed_time": result["embed_time"],
+                        "extract_time": result["extract_time"],
+                    })
+                    if progress_callback:
+                        rate = result["chunks"] / result["embed_time"] if result["embed_time"] > 0 else 0
+                        progress_callback(
+                            f"[{completed_count}/{len(files)}] {action_label}: {result['file_name']} "
+                            f"({result['chunks']} chunks, {result['total_time']:.1f}s, {rate:.1f} c/s)"
+                        )
+    finally:
+        if heartbeat is not None:
+            heartbeat.stop()
+
+    stats["total_time"] = time.time() - folder_start
+
+    if job_id is not None and not stats.get("paused"):
+        metadata_store.complete_indexing_job(job_id, "completed")
+        metadata_store.update_indexing_job_progress(job_id, completed_count)
+
+    return stats
+
+
 def index_folder(
     folder_path: str,
     vector_store: Optional[VectorStore] = None,
     metadata_store: Optional[MetadataStore] = None,
     progress_callback: Optional[Callable[[str], None]] = None,
     force_reindex: bool = False,
-    parallel_workers: int = PARALLEL_WORKERS,
+    parallel_workers: Optional[int] = None,
     max_chunks_per_file: int = MAX_CHUNKS_PER_FILE,
     max_file_size_mb: int = MAX_FILE_SIZE_MB,
     cancel_event: Optional[threading.Event] = None,
@@ -326,7 +629,7 @@ def index_folder(
         metadata_store: Optional existing MetadataStore instance
         progress_callback: Optional callback for progress updates
         force_reindex: If True, reindex all files even if unchanged
-        parallel_workers: Number of parallel workers (default: 3)
+        parallel_workers: Number of parallel workers (default: available CPUs - 1)
         max_chunks_per_file: Max chunks per file before skipping (default: 50)
         max_file_size_mb: Max file size in MB before skipping (default: 50)
         cancel_event: Optional threading.Event to signal cancellation
@@ -341,6 +644,8 @@ def index_folder(
         vector_store = VectorStore(expected_dimension=expected_dim)
     if metadata_store is None:
         metadata_store = MetadataStore()
+    if parallel_workers is None:
+        parallel_workers = _default_workers()
 
     subscription_state = get_subscription_state(user_email)
     allowed_extensions = set(subscription_state.allowed_file_types)
@@ -366,28 +671,10 @@ def index_folder(
                 if remaining_slots <= 0:
                     if progress_callback:
                         progress_callback(f"File limit reached ({max_files_limit} files). Upgrade to Pro for unlimited indexing.")
-                    return {
-                        "total_files": 0,
-                        "indexed_files": 0,
-                        "skipped_unchanged": 0,
-                        "skipped_limits": 0,
-                        "total_chunks": 0,
-                        "total_time": 0.0,
-                        "total_embed_time": 0.0,
-                        "file_times": [],
-                        "errors": [],
-                        "skipped_files": [],
-                        "skipped_by_reason": {
-                            "scanned_image": [],
-                            "empty_file": [],
-                            "file_too_large": [],
-                            "unsupported_type": [],
-                            "chunk_limit_exceeded": [],
-                        },
-                        "cancelled": False,
-                        "file_limit_reached": True,
-                        "file_limit": max_files_limit,
-                    }
+                    stats = _empty_stats(0)
+                    stats["file_limit_reached"] = True
+                    stats["file_limit"] = max_files_limit
+                    return stats
 
                 if len(files) > remaining_slots:
                     if progress_callback:
@@ -404,129 +691,23 @@ def index_folder(
     if progress_callback and not is_resuming:
         progress_callback(f"Found {len(files)} files to process (workers: {parallel_workers}, max chunks: {max_chunks_per_file})")
 
-    stats = {
-        "total_files": len(files),
-        "indexed_files": 0,
-        "skipped_unchanged": 0,
-        "skipped_limits": 0,
-        "total_chunks": 0,
-        "total_time": 0.0,
-        "total_embed_time": 0.0,
-        "file_times": [],
-        "errors": [],
-        "skipped_files": [],
-        "skipped_by_reason": {
-            "scanned_image": [],
-            "empty_file": [],
-            "file_too_large": [],
-            "unsupported_type": [],
-            "chunk_limit_exceeded": [],
-        },
-        "cancelled": False
-    }
-
-    folder_start = time.time()
-    db_lock = threading.Lock()
-    completed_count = 0
-
-    with ThreadPoolExecutor(max_workers=parallel_workers) as executor:
-        futures: dict[Future, str] = {}
-        for file_path in files:
-            if cancel_event and cancel_event.is_set():
-                break
-            futures[executor.submit(
-                _process_single_file,
-                file_path,
-                vector_store,
-                metadata_store,
-                db_lock,
-                force_reindex,
-                max_chunks_per_file,
-                max_file_size_mb
-            )] = file_path
-
-        for future in as_completed(futures):
-            if cancel_event and cancel_event.is_set():
-                stats["cancelled"] = True
-                stats["paused"] = True
-                if progress_callback:
-                    progress_callback("Indexing paused")
-                executor.shutdown(wait=True, cancel_futures=False)
-                if job_id is not None:
-                    metadata_store.update_job_status(job_id, "paused")
-                    metadata_store.update_indexing_job_progress(job_id, completed_count)
-                break
-
-            completed_count += 1
-            result = future.result()
-            file_path = result["file_path"]
-
-            file_status = "completed" if not result.get("error") else "error"
-            if result.get("skipped"):
-                file_status = "skipped"
-            if job_id is not None:
-                metadata_store.update_job_file_status(job_id, file_path, file_status)
-                if completed_count % 10 == 0:
-                    metadata_store.update_indexing_job_progress(job_id, completed_count)
-
-            if result["action"] == "skipped_unchanged":
-                stats["skipped_unchanged"] += 1
-                if progress_callback:
-                    progress_callback(f"[{completed_count}/{len(files)}] Skipped (unchanged): {result['file_name']}")
-            elif result["error"]:
-                stats["errors"].append(f"Error indexing {result['file_path']}: {result['error']}")
-                if progress_callback:
-                    progress_callback(f"[{completed_count}/{len(files)}] ERROR: {result['file_name']} - {result['error']}")
-            elif result["skipped"]:
-                stats["skipped_limits"] += 1
-                stats["file_times"].append({
-                    "file": result["file_name"],
-                    "skipped": True,
-                    "reason": result["skip_reason"]
-                })
-
-                skip_reason = result["skip_reason"]
-                category = _categorize_skip_reason(skip_reason)
-                skipped_entry = {
-                    "file_path": result["file_path"],
-                    "file_name": result["file_name"],
-                    "reason": skip_reason,
-                }
-                if result.get("chunks_would_be"):
-                    skipped_entry["chunks_would_be"] = result["chunks_would_be"]
-
-                stats["skipped_by_reason"][category].append(skipped_entry)
-
-                if category == "chunk_limit_exceeded":
-                    stats["skipped_files"].append(skipped_entry)
-
-                if progress_callback:
-                    progress_callback(f"[{completed_count}/{len(files)}] Skipped ({skip_reason}): {result['file_name']}")
-            else:
-                stats["indexed_files"] += 1
-                stats["total_chunks"] += result["chunks"]
-                stats["total_embed_time"] += result["embed_time"]
-                stats["file_times"].append({
-                    "file": result["file_name"],
-                    "chunks": result["chunks"],
-                    "total_time": result["total_time"],
-                    "embed_time": result["embed_time"],
-                    "extract_time": result["extract_time"],
-                })
-                if progress_callback:
-                    rate = result["chunks"] / result["embed_time"] if result["embed_time"] > 0 else 0
-                    progress_callback(
-                        f"[{completed_count}/{len(files)}] Indexed: {result['file_name']} "
-                        f"({result['chunks']} chunks, {result['total_time']:.1f}s, {rate:.1f} c/s)"
-                    )
-
-    stats["total_time"] = time.time() - folder_start
+    if progress_callback:
+        progress_callback = _ProgressBatcher(progress_callback)
+
+    stats = _run_indexing(
+        files,
+        vector_store=vector_store,
+        metadata_store=metadata_store,
+        force_reindex=force_reindex,
+        parallel_workers=parallel_workers,
+        max_chunks_per_file=max_chunks_per_file,
+        max_file_size_mb=max_file_size_mb,
+        cancel_event=cancel_event,
+        job_id=job_id,
+        progress_callback=progress_callback,
+    )
     stats["job_id"] = job_id
 
-    if job_id is not None and not stats.get("paused"):
-        metadata_store.complete_indexing_job(job_id, "completed")
-        metadata_store.update_indexing_job_progress(job_id, completed_count)
-
     if progress_callback and stats["indexed_files"] > 0:
         sorted_times = sorted(
             [f for f in stats["file_times"] if not f.get("skipped")],
@@ -544,6 +725,9 @@ def index_folder(
         for f in sorted_times[:10]:
             progress_callback(f"  {f['file']}: {f['total_time']:.1f}s ({f['chunks']} chunks, embed: {f['embed_time']:.1f}s)")
 
+    if progress_callback:
+        progress_callback.flush()
+
     return stats
 
 
@@ -552,7 +736,7 @@ def reindex_files(
     vector_store: Optional[VectorStore] = None,
     metadata_store: Optional[MetadataStore] = None,
     progress_callback: Optional[Callable[[str], None]] = None,
-    parallel_workers: int = PARALLEL_WORKERS,
+    parallel_workers: Optional[int] = None,
     max_chunks_per_file: int = MAX_CHUNKS_PER_FILE,
     max_file_size_mb: int = MAX_FILE_SIZE_MB,
     cancel_event: Optional[threading.Event] = None
@@ -565,7 +749,7 @@ def reindex_files(
         vector_store: Optional existing VectorStore instance
         metadata_store: Optional existing MetadataStore instance
         progress_callback: Optional callback for progress updates
-        parallel_workers: Number of parallel workers (default: 3)
+        parallel_workers: Number of parallel workers (default: available CPUs - 1)
         max_chunks_per_file: Max chunks per file before skipping (default: 50)
         max_file_size_mb: Max file size in MB before skipping (default: 50)
         cancel_event: Optional threading.Event to signal cancellation
@@ -578,9 +762,13 @@ def reindex_files(
         vector_store = VectorStore(expected_dimension=expected_dim)
     if metadata_store is None:
         metadata_store = MetadataStore()
+    if parallel_workers is None:
+        parallel_workers = _default_workers()
 
-    existing_files = [f for f in file_paths if Path(f).exists()]
-    missing_files = [f for f in file_paths if not Path(f).exists()]
+    existing_files = []
+    missing_files = []
+    for f in file_paths:
+        (existing_files if os.path.exists(f) else missing_files).append(f)
 
     if progress_callback:
         progress_callback(f"Reindexing {len(existing_files)} files (workers: {parallel_workers}, max chunks: {max_chunks_per_file})")
@@ -593,110 +781,28 @@ def reindex_files(
         if progress_callback:
             progress_callback(f"Removed missing file from index: {Path(missing_file).name}")
 
-    stats = {
-        "total_files": len(existing_files),
-        "indexed_files": 0,
-        "skipped_unchanged": 0,
-        "skipped_limits": 0,
-        "total_chunks": 0,
-        "total_time": 0.0,
-        "total_embed_time": 0.0,
-        "file_times": [],
-        "errors": [],
-        "removed_missing": len(missing_files),
-        "skipped_files": [],
-        "skipped_by_reason": {
-            "scanned_image": [],
-            "empty_file": [],
-            "file_too_large": [],
-            "unsupported_type": [],
-            "chunk_limit_exceeded": [],
-        },
-        "cancelled": False
-    }
-
     if not existing_files:
+        stats = _empty_stats(0)
+        stats["removed_missing"] = len(missing_files)
         return stats
 
-    folder_start = time.time()
-    db_lock = threading.Lock()
-    completed_count = 0
-
-    with ThreadPoolExecutor(max_workers=parallel_workers) as executor:
-        futures: dict[Future, str] = {}
-        for file_path in existing_files:
-            if cancel_event and cancel_event.is_set():
-                break
-            futures[executor.submit(
-                _process_single_file,
-                file_path,
-                vector_store,
-                metadata_store,
-                db_lock,
-                True,
-                max_chunks_per_file,
-                max_file_size_mb
-            )] = file_path
-
-        for future in as_completed(futures):
-            if cancel_event and cancel_event.is_set():
-                stats["cancelled"] = True
-                if progress_callback:
-                    progress_callback("Reindexing cancelled by user")
-                executor.shutdown(wait=True, cancel_futures=False)
-                break
-
-            completed_count += 1
-            result = future.result()
-
-            if result["error"]:
-                stats["errors"].append(f"Error indexing {result['file_path']}: {result['error']}")
-                if progress_callback:
-                    progress_callback(f"[{completed_count}/{len(existing_files)}] ERROR: {result['file_name']} - {result['error']}")
-            elif result["skipped"]:
-                stats["skipped_limits"] += 1
-                stats["file_times"].append({
-                    "file": result["file_name"],
-                    "skipped": True,
-                    "reason": result["skip_reason"]
-                })
-
-                skip_reason = result["skip_reason"]
-                category = _categorize_skip_reason(skip_reason)
-                skipped_entry = {
-                    "file_path": result["file_path"],
-                    "file_name": result["file_name"],
-                    "reason": skip_reason,
-                }
-                if result.get("chunks_would_be"):
-                    skipped_entry["chunks_would_be"] = result["chunks_would_be"]
-
-                stats["skipped_by_reason"][category].append(skipped_entry)
-
-                if category == "chunk_limit_exceeded":
-                    stats["skipped_files"].append(skipped_entry)
-
-                if progress_callback:
-                    progress_callback(f"[{completed_count}/{len(existing_files)}] Skipped ({skip_reason}): {result['file_name']}")
-            else:
-                stats["indexed_files"] += 1
-                stats["total_chunks"] += result["chunks"]
-                stats["total_embed_time"] += result["embed_time"]
-                stats["file_times"].append({
-                    "file": result["file_name"],
-                    "chunks": result["chunks"],
-                    "total_time": result["total_time"],
-                    "embed_time": result["embed_time"],
-                    "extract_time": result["extract_time"],
-                })
-                if progress_callback:
-                    rate = result["chunks"] / result["embed_time"] if result["embed_time"] > 0 else 0
-                    progress_callback(
-                        f"[{completed_count}/{len(existing_files)}] Reindexed: {result['file_name']} "
-                        f"({result['chunks']} chunks, {result['total_time']:.1f}s, {rate:.1f} c/s)"
-                    )
-
-    stats["total_time"] = time.time() - folder_start
+    if progress_callback:
+        progress_callback = _ProgressBatcher(progress_callback)
+
+    stats = _run_indexing(
+        existing_files,
+        vector_store=vector_store,
+        metadata_store=metadata_store,
+        force_reindex=True,
+        parallel_workers=parallel_workers,
+        max_chunks_per_file=max_chunks_per_file,
+        max_file_size_mb=max_file_size_mb,
+        cancel_event=cancel_event,
+        job_id=None,
+        progress_callback=progress_callback,
+        action_label="Reindexed",
+    )
+    stats["removed_missing"] = len(missing_files)
 
     if progress_callback and stats["indexed_files"] > 0:
         progress_callback("\n" + "=" * 50)
@@ -706,4 +812,7 @@ def reindex_files(
         progress_callback(f"Files reindexed: {stats['indexed_files']}")
         progress_callback(f"Total chunks: {stats['total_chunks']}")
 
+    if progress_callback:
+        progress_callback.flush()
+
     return stats
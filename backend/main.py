@@ -11,10 +11,13 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import functools
 import sys
 from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
+if not __package__:
+    # Run as a script (python main.py); `python -m backend.main` needs no path fixup
+    sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from backend.indexer.index_manager import index_folder
 from backend.search.retriever import search_documents, get_unique_files_for_query
@@ -23,6 +26,12 @@ from backend.db.vector_store import get_vector_store
 from backend.db.metadata_store import MetadataStore
 
 
+@functools.lru_cache(maxsize=1)
+def _get_metadata_store() -> MetadataStore:
+    """Single MetadataStore shared by all commands in this process."""
+    return MetadataStore()
+
+
 def cmd_index(args: argparse.Namespace) -> None:
     """Index files in a folder."""
     folder = args.folder
@@ -39,6 +48,7 @@ def cmd_index(args: argparse.Namespace) -> None:
 
     stats = index_folder(
         folder,
+        metadata_store=_get_metadata_store(),
         progress_callback=progress,
         force_reindex=args.force,
         max_chunks_per_file=args.max_chunks
@@ -115,27 +125,35 @@ def cmd_ask(args: argparse.Namespace) -> None:
     print("-" * 40)
     print()
 
+    # Write chunks straight to the buffered stream; flush on newlines or every 16 chunks
+    out = sys.stdout
+    pending = 0
     for chunk in get_answer(query, vector_store, stream=True):
-        print(chunk, end="", flush=True)
-    print()
+        out.write(chunk)
+        pending += 1
+        if pending >= 16 or "\n" in chunk:
+            out.flush()
+            pending = 0
+    out.write("\n")
+    out.flush()
 
 
 def cmd_status(args: argparse.Namespace) -> None:
     """Show indexing status."""
     vector_store = get_vector_store()
-    metadata_store = MetadataStore()
+    metadata_store = _get_metadata_store()
 
     print("Docora Status")
     print("-" * 40)
     print(f"Total chunks in index: {vector_store.count()}")
 
-    files = metadata_store.get_all_files()
+    files = metadata_store.get_file_chunk_counts()
     print(f"Total files indexed: {len(files)}")
 
     if files:
         print("\nIndexed files:")
-        for f in files:
-            print(f"  - {Path(f['file_path']).name} ({f['chunk_count']} chunks)")
+        for file_path, chunk_count in files:
+            print(f"  - {Path(file_path).name} ({chunk_count} chunks)")
 
 
 def main() -> None:
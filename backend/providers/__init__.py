@@ -1,16 +1,23 @@
 """Provider abstraction layer for LLM, embedding, and reranking services."""
 
-from backend.providers.config import ProviderConfig, get_config
-from backend.providers.factory import (
-    get_llm_provider,
-    get_embedding_provider,
-    get_reranking_provider,
-)
+import importlib
 
-__all__ = [
-    "ProviderConfig",
-    "get_config",
-    "get_llm_provider",
-    "get_embedding_provider",
-    "get_reranking_provider",
-]
+_LAZY_IMPORTS = {
+    "ProviderConfig": "backend.providers.config",
+    "get_config": "backend.providers.config",
+    "get_llm_provider": "backend.providers.factory",
+    "get_embedding_provider": "backend.providers.factory",
+    "get_reranking_provider": "backend.providers.factory",
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name: str):
+    """Import exported names on first access (PEP 562)."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,30 @@
+"""Key canonicalization shared by the query and embedding caches."""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """
+    Canonical cache key for a query.
+
+    Applies NFKC normalization, lowercases, and collapses whitespace, so
+    "What  is Rerank? " and "what is rerank?" map to the same key.
+    """
+    query = unicodedata.normalize("NFKC", query)
+    return _WHITESPACE_RE.sub(" ", query).strip().lower()
+
+
+def normalize_embedding_text(text: str) -> str:
+    """
+    Canonical cache key text for query and document embeddings.
+
+    Only NFKC normalization and whitespace collapsing: case and punctuation
+    are kept, since "3.5%" and "35%" or "US" and "us" embed differently.
+    """
+    text = unicodedata.normalize("NFKC", text)
+    return _WHITESPACE_RE.sub(" ", text).strip()
@@ -2,12 +2,18 @@
 
 from __future__ import annotations
 
-import json
+import functools
 import os
 import sqlite3
+import threading
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
+
+try:
+    import keyring as _keyring
+except ImportError:
+    _keyring = None
 
 # Supabase Edge Function proxy URL for secure API key handling
 # This routes LLM/embedding/rerank calls through Supabase where keys are stored securely
@@ -61,7 +67,7 @@ def get_scaled_initial_results(chunk_count: int, base: int = DEFAULT_INITIAL_RES
         return max(base, 250)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ProviderConfig:
     """Configuration for AI providers."""
 
@@ -81,6 +87,17 @@ class ProviderConfig:
     voyage_api_key: Optional[str] = field(default=None, repr=False)
 
 
+_GET_SQL = "SELECT value FROM settings WHERE key = ?"
+_SET_SQL = """
+    INSERT INTO settings (key, value, updated_at)
+    VALUES (?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT(key) DO UPDATE SET
+        value = excluded.value,
+        updated_at = CURRENT_TIMESTAMP
+"""
+_DELETE_SQL = "DELETE FROM settings WHERE key = ?"
+
+
 class ConfigStore:
     """SQLite-based configuration storage."""
 
@@ -97,50 +114,51 @@ class ConfigStore:
             isolation_level=None  # Autocommit mode - prevents nested transaction issues
         )
         self.conn.row_factory = sqlite3.Row
-        self.conn.execute("PRAGMA journal_mode=WAL")
+        self._write_lock = threading.Lock()
         self._init_tables()
 
     def _init_tables(self) -> None:
-        cursor = self.conn.cursor()
-        cursor.execute("""
+        self.conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA mmap_size=67108864;
+            PRAGMA cache_size=-8192;
             CREATE TABLE IF NOT EXISTS settings (
                 key TEXT PRIMARY KEY,
                 value TEXT NOT NULL,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
+            );
         """)
-        self.conn.commit()
 
     def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
         """Get a setting value by key."""
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT value FROM settings WHERE key = ?", (key,))
-        row = cursor.fetchone()
+        row = self.conn.execute(_GET_SQL, (key,)).fetchone()
         return row["value"] if row else default
 
     def set(self, key: str, value: str) -> None:
         """Set a setting value."""
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            INSERT INTO settings (key, value, updated_at)
-            VALUES (?, ?, CURRENT_TIMESTAMP)
-            ON CONFLICT(key) DO UPDATE SET
-                value = excluded.value,
-                updated_at = CURRENT_TIMESTAMP
-        """, (key, value))
-        self.conn.commit()
+        self.conn.execute(_SET_SQL, (key, value))
+
+    def set_many(self, items: List[Tuple[str, str]]) -> None:
+        """Set several settings in a single transaction."""
+        with self._write_lock:
+            self.conn.execute("BEGIN")
+            try:
+                self.conn.executemany(_SET_SQL, items)
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
 
     def delete(self, key: str) -> None:
         """Delete a setting."""
-        cursor = self.conn.cursor()
-        cursor.execute("DELETE FROM settings WHERE key = ?", (key,))
-        self.conn.commit()
+        self.conn.execute(_DELETE_SQL, (key,))
 
     def get_all(self) -> dict[str, str]:
         """Get all settings."""
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT key, value FROM settings")
-        return {row["key"]: row["value"] for row in cursor.fetchall()}
+        rows = self.conn.execute("SELECT key, value FROM settings").fetchall()
+        return {row["key"]: row["value"] for row in rows}
 
     def close(self) -> None:
         """Close the database connection."""
@@ -158,9 +176,33 @@ def _get_config_store() -> ConfigStore:
     return _config_store
 
 
+# (config_version, config) from the last load; see _invalidate_config
+_cached_config: Optional[Tuple[str, ProviderConfig]] = None
+
+
+def _invalidate_config() -> None:
+    """Drop the cached config and bump the stored version for other processes."""
+    global _cached_config
+    store = _get_config_store()
+    version = int(store.get("config_version", "0"))
+    store.set("config_version", str(version + 1))
+    _cached_config = None
+
+
 def get_config() -> ProviderConfig:
-    """Load configuration from database and environment."""
+    """Load configuration from database and environment.
+
+    The result is cached until the stored config_version changes, so
+    repeated calls cost a single SELECT. ProviderConfig is frozen, so the
+    cached instance is shared; use dataclasses.replace to derive changes.
+    """
+    global _cached_config
     store = _get_config_store()
+    version = store.get("config_version", "0")
+
+    cached = _cached_config
+    if cached is not None and cached[0] == version:
+        return cached[1]
 
     config = ProviderConfig(
         llm_provider=store.get("llm_provider", DEFAULT_LLM_PROVIDER),
@@ -172,34 +214,39 @@ def get_config() -> ProviderConfig:
         hybrid_search_enabled=store.get("hybrid_search_enabled", "true").lower() == "true",
         initial_results=int(store.get("initial_results", str(DEFAULT_INITIAL_RESULTS))),
         rerank_to=int(store.get("rerank_to", "10")),
+        openai_api_key=_get_api_key("openai"),
+        google_api_key=_get_api_key("google"),
+        cohere_api_key=_get_api_key("cohere"),
+        voyage_api_key=_get_api_key("voyage"),
     )
 
-    config.openai_api_key = _get_api_key("openai")
-    config.google_api_key = _get_api_key("google")
-    config.cohere_api_key = _get_api_key("cohere")
-    config.voyage_api_key = _get_api_key("voyage")
-
+    _cached_config = (version, config)
     return config
 
 
 def save_config(config: ProviderConfig) -> None:
     """Save configuration to database."""
     store = _get_config_store()
-    store.set("llm_provider", config.llm_provider)
-    store.set("llm_model", config.llm_model)
-    store.set("embedding_provider", config.embedding_provider)
-    store.set("embedding_model", config.embedding_model)
-    store.set("reranking_provider", config.reranking_provider)
-    store.set("reranking_model", config.reranking_model)
-    store.set("hybrid_search_enabled", str(config.hybrid_search_enabled).lower())
-    store.set("initial_results", str(config.initial_results))
-    store.set("rerank_to", str(config.rerank_to))
-
-
+    store.set_many([
+        ("llm_provider", config.llm_provider),
+        ("llm_model", config.llm_model),
+        ("embedding_provider", config.embedding_provider),
+        ("embedding_model", config.embedding_model),
+        ("reranking_provider", config.reranking_provider),
+        ("reranking_model", config.reranking_model),
+        ("hybrid_search_enabled", str(config.hybrid_search_enabled).lower()),
+        ("initial_results", str(config.initial_results)),
+        ("rerank_to", str(config.rerank_to)),
+    ])
+    _invalidate_config()
+
+
+@functools.lru_cache(maxsize=8)
 def _get_api_key(provider: str) -> Optional[str]:
     """Get API key from environment or secure storage.
 
     In proxy mode, returns a placeholder since actual keys are on Supabase.
+    Results are memoized; save_api_key and delete_api_key clear the cache.
     """
     # In proxy mode, we don't need local API keys - they're on Supabase
     # Note: voyage is NOT included - each user must provide their own Voyage API key
@@ -211,13 +258,13 @@ def _get_api_key(provider: str) -> Optional[str]:
     if key:
         return key
 
-    try:
-        import keyring
-        key = keyring.get_password("finderai", f"{provider}_api_key")
-        if key:
-            return key
-    except (ImportError, Exception):
-        pass
+    if _keyring is not None:
+        try:
+            key = _keyring.get_password("finderai", f"{provider}_api_key")
+            if key:
+                return key
+        except Exception:
+            pass
 
     store = _get_config_store()
     key = store.get(f"{provider}_api_key")
@@ -232,8 +279,10 @@ _clerk_token: Optional[str] = None
 
 
 def set_clerk_token(token: str) -> None:
-    """Set the Clerk auth token for proxy requests."""
+    """Set the Clerk auth token for proxy requests; a no-op when it is unchanged."""
     global _clerk_token
+    if token == _clerk_token:
+        return
     _clerk_token = token
 
 
@@ -244,25 +293,31 @@ def get_clerk_token() -> Optional[str]:
 
 def save_api_key(provider: str, api_key: str) -> None:
     """Save API key to secure storage."""
-    try:
-        import keyring
-        keyring.set_password("finderai", f"{provider}_api_key", api_key)
-        return
-    except (ImportError, Exception):
-        pass
+    _get_api_key.cache_clear()
+    if _keyring is not None:
+        try:
+            _keyring.set_password("finderai", f"{provider}_api_key", api_key)
+            _invalidate_config()
+            return
+        except Exception:
+            pass
 
     store = _get_config_store()
     store.set(f"{provider}_api_key", api_key)
+    _invalidate_config()
 
 
 def delete_api_key(provider: str) -> None:
     """Delete API key from secure storage."""
-    try:
-        import keyring
-        keyring.delete_password("finderai", f"{provider}_api_key")
-        return
-    except (ImportError, Exception):
-        pass
+    _get_api_key.cache_clear()
+    if _keyring is not None:
+        try:
+            _keyring.delete_password("finderai", f"{provider}_api_key")
+            _invalidate_config()
+            return
+        except Exception:
+            pass
 
     store = _get_config_store()
     store.delete(f"{provider}_api_key")
+    _invalidate_config()
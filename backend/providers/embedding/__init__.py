@@ -1,13 +1,22 @@
 """Embedding provider implementations."""
 
-from backend.providers.embedding.base import BaseEmbeddingProvider
-from backend.providers.embedding.cohere import CohereEmbeddingProvider
-from backend.providers.embedding.openai import OpenAIEmbeddingProvider
-from backend.providers.embedding.voyage import VoyageEmbeddingProvider
-
-__all__ = [
-    "BaseEmbeddingProvider",
-    "CohereEmbeddingProvider",
-    "OpenAIEmbeddingProvider",
-    "VoyageEmbeddingProvider",
-]
+import importlib
+
+_LAZY_IMPORTS = {
+    "BaseEmbeddingProvider": "backend.providers.embedding.base",
+    "CohereEmbeddingProvider": "backend.providers.embedding.cohere",
+    "OpenAIEmbeddingProvider": "backend.providers.embedding.openai",
+    "VoyageEmbeddingProvider": "backend.providers.embedding.voyage",
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name: str):
+    """Import exported names on first access (PEP 562)."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
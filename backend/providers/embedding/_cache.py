@@ -0,0 +1,78 @@
+"""In-process LRU cache of query embeddings."""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, List, Optional, Tuple
+
+from backend.providers.cache import normalize_embedding_text
+
+DEFAULT_CAPACITY = 1024
+
+CacheKey = Tuple[str, str, str]
+
+
+class QueryEmbeddingCache:
+    """
+    Exact-match LRU cache for query embeddings.
+
+    Keys are (provider, model, sha256(text)), with the text canonicalized
+    by normalize_embedding_text (NFKC and whitespace only), so a repeated
+    question in a chat session skips the embedding API roundtrip.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self._capacity = capacity
+        self._entries: OrderedDict[CacheKey, List[float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(provider: str, model: str, text: str) -> CacheKey:
+        digest = hashlib.sha256(normalize_embedding_text(text).encode("utf-8")).hexdigest()
+        return (provider, model, digest)
+
+    def get(self, key: CacheKey) -> Optional[List[float]]:
+        with self._lock:
+            embedding = self._entries.get(key)
+            if embedding is not None:
+                self._entries.move_to_end(key)
+            return embedding
+
+    def set(self, key: CacheKey, embedding: List[float]) -> None:
+        with self._lock:
+            self._entries[key] = embedding
+            self._entries.move_to_end(key)
+            if len(self._entries) > self._capacity:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_query_cache = QueryEmbeddingCache()
+
+
+def get_query_cache() -> QueryEmbeddingCache:
+    """Get the global query embedding cache."""
+    return _query_cache
+
+
+def cached_query_embedding(
+    embed_query: Callable[..., List[float]],
+) -> Callable[..., List[float]]:
+    """Decorate a provider's embed_query to serve repeated queries from the cache."""
+
+    @functools.wraps(embed_query)
+    def wrapper(self, text: str) -> List[float]:
+        key = QueryEmbeddingCache.key(self.name, self.model, text)
+        embedding = _query_cache.get(key)
+        if embedding is None:
+            embedding = embed_query(self, text)
+            _query_cache.set(key, embedding)
+        return embedding
+
+    return wrapper
@@ -0,0 +1,212 @@
+"""On-disk cache of document embeddings keyed by model and text."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from backend.providers.cache import normalize_embedding_text
+
+# Stay under SQLite's default limit on bound parameters per statement
+_MAX_SQL_VARIABLES = 500
+
+
+class EmbeddingDiskCache:
+    """
+    SQLite-backed embedding cache.
+
+    Vectors are stored as float16 blobs under sha256(model + "|" + text),
+    with the text canonicalized by normalize_embedding_text, so re-indexing
+    unchanged chunks skips the embedding API entirely. Each row also records
+    its model, so vectors for models no longer in use can be pruned.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        if db_path is None:
+            from backend.db.metadata_store import get_data_dir
+            db_path = str(get_data_dir() / "embedding_cache.db")
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key BLOB PRIMARY KEY,
+                vector BLOB NOT NULL,
+                model TEXT NOT NULL DEFAULT ''
+            )
+        """)
+        self._migrate_embeddings_table()
+        self._conn.commit()
+
+    def _migrate_embeddings_table(self) -> None:
+        """Add the model column to embeddings if it doesn't exist."""
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(embeddings)")]
+        if "model" not in columns:
+            self._conn.execute("ALTER TABLE embeddings ADD COLUMN model TEXT NOT NULL DEFAULT ''")
+
+    @staticmethod
+    def key(model: str, text: str) -> bytes:
+        text = normalize_embedding_text(text)
+        return hashlib.sha256(f"{model}|{text}".encode("utf-8")).digest()
+
+    def get(self, key: bytes) -> Optional[np.ndarray]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT vector FROM embeddings WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return np.frombuffer(row[0], dtype=np.float16).astype(np.float32)
+
+    def set(self, model: str, key: bytes, vector: np.ndarray) -> None:
+        blob = np.asarray(vector, dtype=np.float16).tobytes()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO embeddings (key, vector, model) VALUES (?, ?, ?)",
+                (key, blob, model),
+            )
+            self._conn.commit()
+
+    def get_many(self, keys: List[bytes]) -> Dict[bytes, np.ndarray]:
+        """Look up many keys at once; returns only the keys that were found."""
+        found: Dict[bytes, np.ndarray] = {}
+        with self._lock:
+            for i in range(0, len(keys), _MAX_SQL_VARIABLES):
+                chunk = keys[i:i + _MAX_SQL_VARIABLES]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float16).astype(np.float32)
+        return found
+
+    def set_many(self, model: str, items: List[Tuple[bytes, np.ndarray]]) -> None:
+        """Store many vectors for one model in a single transaction."""
+        rows = [
+            (key, np.asarray(vector, dtype=np.float16).tobytes(), model)
+            for key, vector in items
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, model) VALUES (?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+    def prune(self, keep_model: str) -> None:
+        """Delete cached vectors for every model except keep_model."""
+        with self._lock:
+            self._conn.execute("DELETE FROM embeddings WHERE model != ?", (keep_model,))
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Delete all cached vectors."""
+        with self._lock:
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
+
+
+_embedding_cache: Optional[EmbeddingDiskCache] = None
+_embedding_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingDiskCache:
+    """Get or create the global embedding cache."""
+    global _embedding_cache
+    if _embedding_cache is None:
+        with _embedding_cache_lock:
+            if _embedding_cache is None:
+                _embedding_cache = EmbeddingDiskCache()
+    return _embedding_cache
+
+
+def _split_misses(
+    model: str, texts: List[str]
+) -> Tuple[List[bytes], List[Optional[np.ndarray]], Dict[bytes, int]]:
+    """Look texts up in the cache; returns keys, rows (None for misses) and unique misses."""
+    cache = get_embedding_cache()
+    keys = [cache.key(model, text) for text in texts]
+    hits = cache.get_many(keys)
+    rows: List[Optional[np.ndarray]] = [hits.get(key) for key in keys]
+
+    # Texts sharing a cache key get one embedding, so duplicates are sent once
+    unique: Dict[bytes, int] = {}
+    for i, vec in enumerate(rows):
+        if vec is None:
+            unique.setdefault(keys[i], i)
+    return keys, rows, unique
+
+
+def _fill_misses(
+    model: str,
+    keys: List[bytes],
+    rows: List[Optional[np.ndarray]],
+    unique: Dict[bytes, int],
+    embedded: np.ndarray,
+) -> np.ndarray:
+    """Scatter freshly embedded vectors into rows, cache them, and stack the result."""
+    vectors = dict(zip(unique, embedded))
+    for i, vec in enumerate(rows):
+        if vec is None:
+            rows[i] = vectors[keys[i]]
+    get_embedding_cache().set_many(model, list(vectors.items()))
+    return np.stack(rows)
+
+
+def embed_with_cache(
+    model: str,
+    texts: List[str],
+    embed_uncached: Callable[[List[str]], np.ndarray],
+) -> np.ndarray:
+    """
+    Embed texts, serving cached vectors and embedding only the misses.
+
+    Each distinct miss is embedded once, however often it repeats in texts.
+
+    Args:
+        model: Embedding model name, part of the cache key
+        texts: Texts to embed
+        embed_uncached: Called once with the texts missing from the cache
+
+    Returns:
+        float32 array of shape (len(texts), dimension), in input order
+    """
+    keys, rows, unique = _split_misses(model, texts)
+    if not unique:
+        return np.stack(rows)
+    embedded = embed_uncached([texts[i] for i in unique.values()])
+    return _fill_misses(model, keys, rows, unique, embedded)
+
+
+async def aembed_with_cache(
+    model: str,
+    texts: List[str],
+    aembed_uncached: Callable[[List[str]], Awaitable[np.ndarray]],
+) -> np.ndarray:
+    """
+    Async counterpart of embed_with_cache; aembed_uncached is awaited for the misses.
+
+    The SQLite lookups and writes run in a worker thread, off the event loop.
+    """
+    keys, rows, unique = await asyncio.to_thread(_split_misses, model, texts)
+    if not unique:
+        return np.stack(rows)
+    embedded = await aembed_uncached([texts[i] for i in unique.values()])
+    return await asyncio.to_thread(_fill_misses, model, keys, rows, unique, embedded)
+
+
+def reset_embedding_cache() -> None:
+    """Reset the global embedding cache."""
+    global _embedding_cache
+    _embedding_cache = None
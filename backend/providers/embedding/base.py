@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
 from typing import List
 
+import numpy as np
+
 
 class BaseEmbeddingProvider(ABC):
     """Abstract base class for embedding providers."""
@@ -28,7 +31,7 @@ class BaseEmbeddingProvider(ABC):
         pass
 
     @abstractmethod
-    def embed(self, texts: List[str]) -> List[List[float]]:
+    def embed(self, texts: List[str]) -> np.ndarray:
         """
         Generate embeddings for multiple texts.
 
@@ -36,10 +39,25 @@ class BaseEmbeddingProvider(ABC):
             texts: List of texts to embed
 
         Returns:
-            List of embedding vectors
+            float32 array of shape (len(texts), dimension)
         """
         pass
 
+    async def aembed(self, texts: List[str]) -> np.ndarray:
+        """
+        Async variant of embed for callers running on an event loop.
+
+        The default runs embed in a worker thread; providers with an async
+        client override it to dispatch batches concurrently on the loop.
+
+        Args:
+            texts: List of texts to embed
+
+        Returns:
+            float32 array of shape (len(texts), dimension)
+        """
+        return await asyncio.to_thread(self.embed, texts)
+
     @abstractmethod
     def embed_query(self, text: str) -> List[float]:
         """
@@ -53,6 +71,10 @@ class BaseEmbeddingProvider(ABC):
         """
         pass
 
+    def warmup(self) -> None:
+        """Import the SDK and build the client ahead of the first request. No-op by default."""
+        pass
+
     @abstractmethod
     def is_available(self) -> bool:
         """Check if the provider is available and configured."""
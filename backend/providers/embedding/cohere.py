@@ -2,11 +2,18 @@
 
 from __future__ import annotations
 
-from typing import List
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+import numpy as np
 
 from backend.providers.embedding.base import BaseEmbeddingProvider
+from backend.providers.embedding._cache import cached_query_embedding
+from backend.providers.embedding._diskcache import embed_with_cache
 from backend.providers.config import is_proxy_mode_enabled
-from backend.providers.proxy_client import proxy_embeddings
+from backend.providers.proxy_client import proxy_embed_query, proxy_embeddings
 
 
 COHERE_EMBEDDING_MODELS = [
@@ -26,12 +33,55 @@ MODEL_DIMENSIONS = {
 }
 
 
+MODEL_MAX_TOKENS = {
+    "embed-v4.0": 128000,
+    "embed-english-v3.0": 512,
+    "embed-multilingual-v3.0": 512,
+    "embed-english-light-v3.0": 512,
+    "embed-multilingual-light-v3.0": 512,
+}
+
+# Concurrent embed requests per call; lower this to stay under Cohere's rate limit.
+COHERE_CONCURRENCY = max(1, int(os.environ.get("COHERE_CONCURRENCY", "4")))
+MAX_RETRIES = 3
+
+MAX_BATCH_TEXTS = 96
+MAX_BATCH_TOKENS = 120_000
+# Rough chars-per-token ratio for English text; avoids a tokenizer dependency
+CHARS_PER_TOKEN = 4
+
+
+def _estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def _pack_batches(token_counts: List[int]) -> List[List[int]]:
+    """
+    Group text indices into batches of at most MAX_BATCH_TEXTS texts and
+    MAX_BATCH_TOKENS estimated tokens, packing largest texts first.
+    """
+    batches: List[List[int]] = []
+    batch_tokens: List[int] = []
+    for i in sorted(range(len(token_counts)), key=token_counts.__getitem__, reverse=True):
+        tokens = token_counts[i]
+        for b, batch in enumerate(batches):
+            if len(batch) < MAX_BATCH_TEXTS and batch_tokens[b] + tokens <= MAX_BATCH_TOKENS:
+                batch.append(i)
+                batch_tokens[b] += tokens
+                break
+        else:
+            batches.append([i])
+            batch_tokens.append(tokens)
+    return batches
+
+
 class CohereEmbeddingProvider(BaseEmbeddingProvider):
     """Embedding provider using Cohere API."""
 
     def __init__(self, api_key: str, model: str = "embed-v4.0"):
         self._api_key = api_key
         self._model = model
+        self._dimension = MODEL_DIMENSIONS.get(model, 1536)
         self._client = None
 
     def _get_client(self):
@@ -51,47 +101,67 @@ class CohereEmbeddingProvider(BaseEmbeddingProvider):
 
     @property
     def dimension(self) -> int:
-        return MODEL_DIMENSIONS.get(self._model, 1536)
+        return self._dimension
 
-    def embed(self, texts: List[str]) -> List[List[float]]:
+    def embed(self, texts: List[str]) -> np.ndarray:
         if not texts:
-            return []
+            return np.empty((0, self.dimension), dtype=np.float32)
+
+        return embed_with_cache(self._model, texts, self._embed_uncached)
+
+    def _embed_uncached(self, texts: List[str]) -> np.ndarray:
+        # Truncate oversize texts here rather than shipping them for the API to cut
+        max_chars = MODEL_MAX_TOKENS.get(self._model, 512) * CHARS_PER_TOKEN
+        texts = [text[:max_chars] for text in texts]
 
         if is_proxy_mode_enabled():
-            return proxy_embeddings(
+            embeddings = proxy_embeddings(
                 texts=texts,
                 model=self._model,
                 provider="cohere",
                 input_type="document",
             )
+            return np.asarray(embeddings, dtype=np.float32)
 
-        client = self._get_client()
+        batches = _pack_batches([_estimate_tokens(text) for text in texts])
 
-        batch_size = 96
-        all_embeddings = []
+        if len(batches) == 1:
+            return self._embed_batch(texts)
 
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
-            response = client.embed(
-                texts=batch,
-                model=self._model,
-                input_type="search_document",
-                embedding_types=["float"],
+        with ThreadPoolExecutor(max_workers=min(COHERE_CONCURRENCY, len(batches))) as executor:
+            results = executor.map(
+                lambda indices: self._embed_batch([texts[i] for i in indices]),
+                batches,
             )
-            embeddings = response.embeddings.float_
-            all_embeddings.extend(embeddings)
-
-        return all_embeddings
+            out: Optional[np.ndarray] = None
+            for indices, embeddings in zip(batches, results):
+                if out is None:
+                    out = np.empty((len(texts), embeddings.shape[1]), dtype=np.float32)
+                out[indices] = embeddings
+        return out
+
+    def _embed_batch(self, batch: List[str]) -> np.ndarray:
+        """Embed one batch, backing off and retrying when rate limited."""
+        client = self._get_client()
 
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                response = client.embed(
+                    texts=batch,
+                    model=self._model,
+                    input_type="search_document",
+                    embedding_types=["float"],
+                )
+                return np.asarray(response.embeddings.float_, dtype=np.float32)
+            except Exception as e:
+                if getattr(e, "status_code", None) != 429 or attempt == MAX_RETRIES:
+                    raise
+                time.sleep(2 ** attempt)
+
+    @cached_query_embedding
     def embed_query(self, text: str) -> List[float]:
         if is_proxy_mode_enabled():
-            result = proxy_embeddings(
-                texts=[text],
-                model=self._model,
-                provider="cohere",
-                input_type="query",
-            )
-            return result[0] if result else []
+            return proxy_embed_query(text, model=self._model, provider="cohere")
 
         client = self._get_client()
         response = client.embed(
@@ -102,6 +172,10 @@ class CohereEmbeddingProvider(BaseEmbeddingProvider):
         )
         return response.embeddings.float_[0]
 
+    def warmup(self) -> None:
+        if not is_proxy_mode_enabled():
+            self._get_client()
+
     def is_available(self) -> bool:
         """Check if API key is configured."""
         return bool(self._api_key)
@@ -2,11 +2,19 @@
 
 from __future__ import annotations
 
-from typing import List
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+import numpy as np
 
 from backend.providers.embedding.base import BaseEmbeddingProvider
+from backend.providers.embedding._cache import cached_query_embedding
+from backend.providers.embedding._diskcache import aembed_with_cache, embed_with_cache
 from backend.providers.config import is_proxy_mode_enabled
-from backend.providers.proxy_client import proxy_embeddings
+from backend.providers.proxy_client import get_http_client, proxy_embed_query, proxy_embeddings, proxy_embeddings_async
 
 
 OPENAI_EMBEDDING_MODELS = [
@@ -21,6 +29,54 @@ MODEL_DIMENSIONS = {
     "text-embedding-ada-002": 1536,
 }
 
+# OpenAI caps a request at 2048 inputs and 300K tokens; stay below the token cap
+MAX_BATCH_TEXTS = 2048
+MAX_BATCH_TOKENS = 250_000
+# Rough chars-per-token ratio, used when tiktoken is not installed
+CHARS_PER_TOKEN = 4
+# Concurrent embed requests per call; lower this to stay under OpenAI's rate limit.
+OPENAI_CONCURRENCY = max(1, int(os.environ.get("OPENAI_CONCURRENCY", "5")))
+MAX_RETRIES = 3
+
+
+def _token_counter(model: str) -> Callable[[str], int]:
+    """Return a token counter for model, falling back to a length estimate."""
+    try:
+        import tiktoken
+        encoding = tiktoken.encoding_for_model(model)
+    except Exception:
+        return lambda text: len(text) // CHARS_PER_TOKEN + 1
+    return lambda text: len(encoding.encode(text, disallowed_special=()))
+
+
+def _pack_batches(order: List[int], token_counts: List[int]) -> List[List[int]]:
+    """
+    Greedily group text indices, in the given order, into batches of at most
+    MAX_BATCH_TEXTS texts and MAX_BATCH_TOKENS tokens.
+    """
+    batches: List[List[int]] = []
+    batch: List[int] = []
+    batch_tokens = 0
+    for i in order:
+        tokens = token_counts[i]
+        if batch and (len(batch) >= MAX_BATCH_TEXTS or batch_tokens + tokens > MAX_BATCH_TOKENS):
+            batches.append(batch)
+            batch = []
+            batch_tokens = 0
+        batch.append(i)
+        batch_tokens += tokens
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def _to_array(data: list) -> np.ndarray:
+    """Copy response.data embeddings straight into a float32 array, row by row."""
+    out = np.empty((len(data), len(data[0].embedding)), dtype=np.float32)
+    for row, item in zip(out, data):
+        row[:] = item.embedding
+    return out
+
 
 class OpenAIEmbeddingProvider(BaseEmbeddingProvider):
     """Embedding provider using OpenAI API."""
@@ -28,15 +84,24 @@ class OpenAIEmbeddingProvider(BaseEmbeddingProvider):
     def __init__(self, api_key: str, model: str = "text-embedding-3-large"):
         self._api_key = api_key
         self._model = model
+        self._dimension = MODEL_DIMENSIONS.get(model, 3072)
         self._client = None
+        self._async_client = None
 
     def _get_client(self):
         """Lazy-load OpenAI client."""
         if self._client is None:
             from openai import OpenAI
-            self._client = OpenAI(api_key=self._api_key)
+            self._client = OpenAI(api_key=self._api_key, http_client=get_http_client())
         return self._client
 
+    def _get_async_client(self):
+        """Lazy-load async OpenAI client."""
+        if self._async_client is None:
+            from openai import AsyncOpenAI
+            self._async_client = AsyncOpenAI(api_key=self._api_key)
+        return self._async_client
+
     @property
     def name(self) -> str:
         return "openai"
@@ -47,45 +112,106 @@ class OpenAIEmbeddingProvider(BaseEmbeddingProvider):
 
     @property
     def dimension(self) -> int:
-        return MODEL_DIMENSIONS.get(self._model, 3072)
+        return self._dimension
 
-    def embed(self, texts: List[str]) -> List[List[float]]:
+    def embed(self, texts: List[str]) -> np.ndarray:
         if not texts:
-            return []
+            return np.empty((0, self.dimension), dtype=np.float32)
 
+        return embed_with_cache(self._model, texts, self._embed_uncached)
+
+    def _embed_uncached(self, texts: List[str]) -> np.ndarray:
         if is_proxy_mode_enabled():
-            return proxy_embeddings(
+            embeddings = proxy_embeddings(
                 texts=texts,
                 model=self._model,
                 provider="openai",
                 input_type="document",
             )
+            return np.asarray(embeddings, dtype=np.float32)
 
-        client = self._get_client()
+        batches = self._plan_batches(texts)
 
-        batch_size = 100
-        all_embeddings = []
+        if len(batches) == 1:
+            return self._embed_batch(texts)
 
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
-            response = client.embeddings.create(
-                model=self._model,
-                input=batch,
+        all_embeddings: Optional[np.ndarray] = None
+        with ThreadPoolExecutor(max_workers=min(OPENAI_CONCURRENCY, len(batches))) as executor:
+            results = executor.map(
+                lambda indices: self._embed_batch([texts[i] for i in indices]),
+                batches,
             )
-            embeddings = [item.embedding for item in response.data]
-            all_embeddings.extend(embeddings)
+            for indices, embeddings in zip(batches, results):
+                if all_embeddings is None:
+                    all_embeddings = np.empty((len(texts), embeddings.shape[1]), dtype=np.float32)
+                all_embeddings[indices] = embeddings
 
         return all_embeddings
 
-    def embed_query(self, text: str) -> List[float]:
+    def _plan_batches(self, texts: List[str]) -> List[List[int]]:
+        # Batch similar-length texts together so no batch waits on one long outlier
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        count_tokens = _token_counter(self._model)
+        return _pack_batches(order, [count_tokens(text) for text in texts])
+
+    def _embed_batch(self, batch: List[str]) -> np.ndarray:
+        """Embed one batch, backing off and retrying when rate limited."""
+        create = self._get_client().embeddings.create
+
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                return _to_array(create(model=self._model, input=batch).data)
+            except Exception as e:
+                if getattr(e, "status_code", None) != 429 or attempt == MAX_RETRIES:
+                    raise
+                time.sleep(2 ** attempt)
+
+    async def aembed(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return await super().aembed(texts)
+
+        return await aembed_with_cache(self._model, texts, self._aembed_uncached)
+
+    async def _aembed_uncached(self, texts: List[str]) -> np.ndarray:
         if is_proxy_mode_enabled():
-            result = proxy_embeddings(
-                texts=[text],
+            embeddings = await proxy_embeddings_async(
+                texts=texts,
                 model=self._model,
                 provider="openai",
-                input_type="query",
+                input_type="document",
             )
-            return result[0] if result else []
+            return np.asarray(embeddings, dtype=np.float32)
+
+        batches = self._plan_batches(texts)
+        semaphore = asyncio.Semaphore(OPENAI_CONCURRENCY)
+
+        async def run(indices: List[int]) -> np.ndarray:
+            async with semaphore:
+                return await self._aembed_batch([texts[i] for i in indices])
+
+        results = await asyncio.gather(*(run(indices) for indices in batches))
+
+        all_embeddings = np.empty((len(texts), results[0].shape[1]), dtype=np.float32)
+        for indices, embeddings in zip(batches, results):
+            all_embeddings[indices] = embeddings
+        return all_embeddings
+
+    async def _aembed_batch(self, batch: List[str]) -> np.ndarray:
+        """Async _embed_batch: embed one batch, retrying when rate limited."""
+        create = self._get_async_client().embeddings.create
+
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                return _to_array((await create(model=self._model, input=batch)).data)
+            except Exception as e:
+                if getattr(e, "status_code", None) != 429 or attempt == MAX_RETRIES:
+                    raise
+                await asyncio.sleep(2 ** attempt)
+
+    @cached_query_embedding
+    def embed_query(self, text: str) -> List[float]:
+        if is_proxy_mode_enabled():
+            return proxy_embed_query(text, model=self._model, provider="openai")
 
         client = self._get_client()
         response = client.embeddings.create(
@@ -94,6 +220,10 @@ class OpenAIEmbeddingProvider(BaseEmbeddingProvider):
         )
         return response.data[0].embedding
 
+    def warmup(self) -> None:
+        if not is_proxy_mode_enabled():
+            self._get_client()
+
     def is_available(self) -> bool:
         """Check if API key is configured."""
         return bool(self._api_key)
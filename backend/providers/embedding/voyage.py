@@ -2,11 +2,19 @@
 
 from __future__ import annotations
 
-from typing import List
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+import numpy as np
 
 from backend.providers.embedding.base import BaseEmbeddingProvider
+from backend.providers.embedding._cache import cached_query_embedding
+from backend.providers.embedding._diskcache import aembed_with_cache, embed_with_cache
 from backend.providers.config import is_proxy_mode_enabled
-from backend.providers.proxy_client import proxy_embeddings
+from backend.providers.proxy_client import proxy_embed_query, proxy_embeddings, proxy_embeddings_async
 
 
 VOYAGE_EMBEDDING_MODELS = [
@@ -29,6 +37,11 @@ MODEL_DIMENSIONS = {
     "voyage-multilingual-2": 1024,
 }
 
+BATCH_SIZE = 128
+# Concurrent embed requests per call; lower this to stay under Voyage's rate limit.
+VOYAGE_CONCURRENCY = max(1, int(os.environ.get("VOYAGE_CONCURRENCY", "5")))
+MAX_RETRIES = 3
+
 
 class VoyageEmbeddingProvider(BaseEmbeddingProvider):
     """Embedding provider using Voyage AI API."""
@@ -36,7 +49,9 @@ class VoyageEmbeddingProvider(BaseEmbeddingProvider):
     def __init__(self, api_key: str, model: str = "voyage-3-large"):
         self._api_key = api_key
         self._model = model
+        self._dimension = MODEL_DIMENSIONS.get(model, 1024)
         self._client = None
+        self._async_client = None
 
     def _get_client(self):
         """Lazy-load Voyage AI client."""
@@ -45,6 +60,13 @@ class VoyageEmbeddingProvider(BaseEmbeddingProvider):
             self._client = voyageai.Client(api_key=self._api_key)
         return self._client
 
+    def _get_async_client(self):
+        """Lazy-load async Voyage AI client."""
+        if self._async_client is None:
+            import voyageai
+            self._async_client = voyageai.AsyncClient(api_key=self._api_key)
+        return self._async_client
+
     @property
     def name(self) -> str:
         return "voyage"
@@ -55,45 +77,119 @@ class VoyageEmbeddingProvider(BaseEmbeddingProvider):
 
     @property
     def dimension(self) -> int:
-        return MODEL_DIMENSIONS.get(self._model, 1024)
+        return self._dimension
 
-    def embed(self, texts: List[str]) -> List[List[float]]:
+    def embed(self, texts: List[str]) -> np.ndarray:
         if not texts:
-            return []
+            return np.empty((0, self.dimension), dtype=np.float32)
 
+        return embed_with_cache(self._model, texts, self._embed_uncached)
+
+    def _embed_uncached(self, texts: List[str]) -> np.ndarray:
         if is_proxy_mode_enabled():
-            return proxy_embeddings(
+            embeddings = proxy_embeddings(
                 texts=texts,
                 model=self._model,
                 provider="voyage",
                 input_type="document",
             )
+            return np.asarray(embeddings, dtype=np.float32)
+
+        batches = self._plan_batches(texts)
+
+        if len(batches) == 1:
+            return self._embed_batch(texts)
+
+        all_embeddings: Optional[np.ndarray] = None
+        with ThreadPoolExecutor(max_workers=min(VOYAGE_CONCURRENCY, len(batches))) as executor:
+            results = executor.map(
+                lambda indices: self._embed_batch([texts[i] for i in indices]),
+                batches,
+            )
+            for indices, embeddings in zip(batches, results):
+                if all_embeddings is None:
+                    all_embeddings = np.empty((len(texts), embeddings.shape[1]), dtype=np.float32)
+                all_embeddings[indices] = embeddings
+
+        return all_embeddings
+
+    def _plan_batches(self, texts: List[str]) -> List[List[int]]:
+        # Batch similar-length texts together so no batch waits on one long outlier
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        return [order[i:i + BATCH_SIZE] for i in range(0, len(order), BATCH_SIZE)]
+
+    def _embed_batch(self, batch: List[str]) -> np.ndarray:
+        """Embed one batch, backing off and retrying when rate limited."""
+        from voyageai.error import RateLimitError
 
         client = self._get_client()
 
-        batch_size = 128
-        all_embeddings = []
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                response = client.embed(
+                    batch,
+                    model=self._model,
+                    input_type="document",
+                )
+                return np.asarray(response.embeddings, dtype=np.float32)
+            except RateLimitError:
+                if attempt == MAX_RETRIES:
+                    raise
+                time.sleep(2 ** attempt)
+
+    async def aembed(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return await super().aembed(texts)
+
+        return await aembed_with_cache(self._model, texts, self._aembed_uncached)
 
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
-            response = client.embed(
-                batch,
+    async def _aembed_uncached(self, texts: List[str]) -> np.ndarray:
+        if is_proxy_mode_enabled():
+            embeddings = await proxy_embeddings_async(
+                texts=texts,
                 model=self._model,
+                provider="voyage",
                 input_type="document",
             )
-            all_embeddings.extend(response.embeddings)
+            return np.asarray(embeddings, dtype=np.float32)
+
+        batches = self._plan_batches(texts)
+        semaphore = asyncio.Semaphore(VOYAGE_CONCURRENCY)
 
+        async def run(indices: List[int]) -> np.ndarray:
+            async with semaphore:
+                return await self._aembed_batch([texts[i] for i in indices])
+
+        results = await asyncio.gather(*(run(indices) for indices in batches))
+
+        all_embeddings = np.empty((len(texts), results[0].shape[1]), dtype=np.float32)
+        for indices, embeddings in zip(batches, results):
+            all_embeddings[indices] = embeddings
         return all_embeddings
 
+    async def _aembed_batch(self, batch: List[str]) -> np.ndarray:
+        """Async _embed_batch: embed one batch, retrying when rate limited."""
+        from voyageai.error import RateLimitError
+
+        client = self._get_async_client()
+
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                response = await client.embed(
+                    batch,
+                    model=self._model,
+                    input_type="document",
+                )
+                return np.asarray(response.embeddings, dtype=np.float32)
+            except RateLimitError:
+                if attempt == MAX_RETRIES:
+                    raise
+                await asyncio.sleep(2 ** attempt)
+
+    @cached_query_embedding
     def embed_query(self, text: str) -> List[float]:
         if is_proxy_mode_enabled():
-            result = proxy_embeddings(
-                texts=[text],
-                model=self._model,
-                provider="voyage",
-                input_type="query",
-            )
-            return result[0] if result else []
+            return proxy_embed_query(text, model=self._model, provider="voyage")
 
         client = self._get_client()
         response = client.embed(
@@ -103,6 +199,10 @@ class VoyageEmbeddingProvider(BaseEmbeddingProvider):
         )
         return response.embeddings[0]
 
+    def warmup(self) -> None:
+        if not is_proxy_mode_enabled():
+            self._get_client()
+
     def is_available(self) -> bool:
         """Check if API key is configured."""
         return bool(self._api_key)
@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
-from typing import Optional
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
 
-from backend.providers.config import get_config, ProviderConfig
+from backend.providers.config import get_config, is_proxy_mode_enabled, ProviderConfig
 from backend.providers.llm.base import BaseLLMProvider
 from backend.providers.llm.ollama import OllamaLLMProvider
 from backend.providers.llm.openai import OpenAILLMProvider
@@ -18,6 +19,34 @@ from backend.providers.reranking.cohere import CohereRerankingProvider
 from backend.providers.reranking.cross_encoder import CrossEncoderRerankingProvider
 from backend.providers.reranking.llm_reranker import LLMRerankingProvider
 from backend.providers.reranking.none import NoopRerankingProvider
+from backend.providers.proxy_client import get_http_client
+
+
+# Provider instances keyed by kind plus every config field they depend on, so
+# a changed model or API key yields a new key and a fresh instance
+_instances: Dict[Tuple, Any] = {}
+_instances_lock = threading.Lock()
+MAX_CACHED_PROVIDERS = 32
+
+
+def _get_or_create(key: Tuple, create: Callable[[], Any]) -> Any:
+    """Return the cached instance for key, creating it on first use."""
+    instance = _instances.get(key)
+    if instance is None:
+        with _instances_lock:
+            instance = _instances.get(key)
+            if instance is None:
+                if len(_instances) >= MAX_CACHED_PROVIDERS:
+                    _instances.clear()
+                instance = create()
+                _instances[key] = instance
+    return instance
+
+
+def reset_provider_cache() -> None:
+    """Drop all cached provider instances."""
+    with _instances_lock:
+        _instances.clear()
 
 
 def get_llm_provider(
@@ -41,7 +70,13 @@ def get_llm_provider(
 
     provider_name = provider or config.llm_provider
     model_name = model or config.llm_model
+    key = ("llm", provider_name, model_name, config.openai_api_key, config.google_api_key)
+    return _get_or_create(key, lambda: _create_llm_provider(config, provider_name, model_name))
+
 
+def _create_llm_provider(
+    config: ProviderConfig, provider_name: str, model_name: str
+) -> BaseLLMProvider:
     if provider_name == "openai":
         if not config.openai_api_key:
             return OllamaLLMProvider(model="llama3.1:8b")
@@ -68,6 +103,14 @@ class EmbeddingProviderNotConfiguredError(Exception):
         super().__init__(f"Embedding provider '{provider}' requires an API key. Please configure it in settings.")
 
 
+# provider name -> (model prefix, default model, provider class, ProviderConfig key attribute)
+EMBEDDING_PROVIDER_TABLE: Dict[str, Tuple[str, str, Callable[..., BaseEmbeddingProvider], str]] = {
+    "voyage": ("voyage", "voyage-3-large", VoyageEmbeddingProvider, "voyage_api_key"),
+    "openai": ("text-embedding", "text-embedding-3-large", OpenAIEmbeddingProvider, "openai_api_key"),
+    "cohere": ("embed", "embed-v4.0", CohereEmbeddingProvider, "cohere_api_key"),
+}
+
+
 def get_embedding_provider(
     config: Optional[ProviderConfig] = None,
     provider: Optional[str] = None,
@@ -93,36 +136,20 @@ def get_embedding_provider(
     provider_name = provider or config.embedding_provider
     model_name = model or config.embedding_model
 
-    if provider_name == "voyage" and not model_name.startswith("voyage"):
-        model_name = "voyage-3-large"
-    elif provider_name == "openai" and not model_name.startswith("text-embedding"):
-        model_name = "text-embedding-3-large"
-    elif provider_name == "cohere" and not model_name.startswith("embed"):
-        model_name = "embed-v4.0"
-
-    if provider_name == "voyage":
-        if not config.voyage_api_key:
-            raise EmbeddingProviderNotConfiguredError("voyage")
-        return VoyageEmbeddingProvider(
-            api_key=config.voyage_api_key,
-            model=model_name,
-        )
-    elif provider_name == "cohere":
-        if not config.cohere_api_key:
-            raise EmbeddingProviderNotConfiguredError("cohere")
-        return CohereEmbeddingProvider(
-            api_key=config.cohere_api_key,
-            model=model_name,
-        )
-    elif provider_name == "openai":
-        if not config.openai_api_key:
-            raise EmbeddingProviderNotConfiguredError("openai")
-        return OpenAIEmbeddingProvider(
-            api_key=config.openai_api_key,
-            model=model_name,
-        )
-    else:
+    entry = EMBEDDING_PROVIDER_TABLE.get(provider_name)
+    if entry is None:
         raise EmbeddingProviderNotConfiguredError(provider_name)
+    model_prefix, default_model, provider_class, api_key_attr = entry
+
+    if not model_name.startswith(model_prefix):
+        model_name = default_model
+
+    api_key = getattr(config, api_key_attr)
+    if not api_key:
+        raise EmbeddingProviderNotConfiguredError(provider_name)
+
+    key = ("embedding", provider_name, model_name, api_key)
+    return _get_or_create(key, lambda: provider_class(api_key=api_key, model=model_name))
 
 
 def get_reranking_provider(
@@ -146,6 +173,22 @@ def get_reranking_provider(
 
     provider_name = provider or config.reranking_provider
 
+    if provider_name == "llm" and llm_provider is None:
+        llm_provider = get_llm_provider(config)
+    key = (
+        "reranking", provider_name, config.reranking_model,
+        config.cohere_api_key, llm_provider,
+    )
+    return _get_or_create(
+        key, lambda: _create_reranking_provider(config, provider_name, llm_provider)
+    )
+
+
+def _create_reranking_provider(
+    config: ProviderConfig,
+    provider_name: str,
+    llm_provider: Optional[BaseLLMProvider],
+) -> BaseRerankingProvider:
     if provider_name == "cohere":
         if not config.cohere_api_key:
             return NoopRerankingProvider()
@@ -156,8 +199,27 @@ def get_reranking_provider(
     elif provider_name == "cross_encoder":
         return CrossEncoderRerankingProvider()
     elif provider_name == "llm":
-        if llm_provider is None:
-            llm_provider = get_llm_provider(config)
         return LLMRerankingProvider(llm_provider)
     else:
         return NoopRerankingProvider()
+
+
+def warmup_providers(config: Optional[ProviderConfig] = None) -> None:
+    """
+    Build the configured providers and load their SDKs ahead of the first request.
+
+    Instances land in the factory cache, so the first query reuses them.
+    Failures (missing API key, SDK not installed, Ollama not running) are
+    ignored here and surface on first real use as before.
+    """
+    if config is None:
+        config = get_config()
+
+    if is_proxy_mode_enabled():
+        get_http_client()
+
+    for get_provider in (get_llm_provider, get_embedding_provider, get_reranking_provider):
+        try:
+            get_provider(config).warmup()
+        except Exception:
+            pass
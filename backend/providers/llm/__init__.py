@@ -1,14 +1,23 @@
 """LLM provider implementations."""
 
-from backend.providers.llm.base import BaseLLMProvider, Message
-from backend.providers.llm.ollama import OllamaLLMProvider
-from backend.providers.llm.openai import OpenAILLMProvider
-from backend.providers.llm.google import GoogleLLMProvider
-
-__all__ = [
-    "BaseLLMProvider",
-    "Message",
-    "OllamaLLMProvider",
-    "OpenAILLMProvider",
-    "GoogleLLMProvider",
-]
+import importlib
+
+_LAZY_IMPORTS = {
+    "BaseLLMProvider": "backend.providers.llm.base",
+    "Message": "backend.providers.llm.base",
+    "OllamaLLMProvider": "backend.providers.llm.ollama",
+    "OpenAILLMProvider": "backend.providers.llm.openai",
+    "GoogleLLMProvider": "backend.providers.llm.google",
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name: str):
+    """Import exported names on first access (PEP 562)."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
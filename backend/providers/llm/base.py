@@ -3,16 +3,26 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Generator, List, Literal, Optional
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Message:
     """A message in a conversation."""
 
     role: Literal["system", "user", "assistant"]
     content: str
+    _dict: Optional[dict] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def as_dict(self) -> dict:
+        """The {"role", "content"} dict for API calls, built once per message."""
+        d = self._dict
+        if d is None:
+            d = {"role": self.role, "content": self.content}
+            object.__setattr__(self, "_dict", d)
+        return d
 
 
 class BaseLLMProvider(ABC):
@@ -48,6 +58,10 @@ class BaseLLMProvider(ABC):
         """
         pass
 
+    def warmup(self) -> None:
+        """Import the SDK and build the client ahead of the first request. No-op by default."""
+        pass
+
     @abstractmethod
     def is_available(self) -> bool:
         """Check if the provider is available and configured."""
@@ -60,4 +74,4 @@ class BaseLLMProvider(ABC):
 
     def _messages_to_dicts(self, messages: List[Message]) -> List[dict]:
         """Convert Message objects to dicts for API calls."""
-        return [{"role": m.role, "content": m.content} for m in messages]
+        return [m.as_dict for m in messages]
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Generator, List, Optional
+from typing import Any, Dict, Generator, List, Optional, Tuple
 
 from backend.providers.llm.base import BaseLLMProvider, Message
 
@@ -26,6 +26,8 @@ class GoogleLLMProvider(BaseLLMProvider):
         self._api_key = api_key
         self._model = model
         self._client = None
+        # GenerativeModel per (model, system instruction); system prompts are fixed strings
+        self._models: Dict[Tuple[str, Optional[str]], Any] = {}
 
     def _get_client(self):
         """Lazy-load Google Generative AI client."""
@@ -61,10 +63,14 @@ class GoogleLLMProvider(BaseLLMProvider):
             elif msg.role == "assistant":
                 chat_messages.append({"role": "model", "parts": [msg.content]})
 
-        model = genai.GenerativeModel(
-            model_name=self._model,
-            system_instruction=system_instruction,
-        )
+        key = (self._model, system_instruction)
+        model = self._models.get(key)
+        if model is None:
+            model = genai.GenerativeModel(
+                model_name=self._model,
+                system_instruction=system_instruction,
+            )
+            self._models[key] = model
 
         if stream:
             return self._stream_response(model, chat_messages)
@@ -91,8 +97,12 @@ class GoogleLLMProvider(BaseLLMProvider):
             )
 
         for chunk in response:
-            if chunk.text:
-                yield chunk.text
+            text = chunk.text
+            if text:
+                yield text
+
+    def warmup(self) -> None:
+        self._get_client()
 
     def is_available(self) -> bool:
         """Check if API key is configured."""
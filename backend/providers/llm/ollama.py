@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
+import time
 from typing import Generator, List, Optional
 
 from backend.providers.llm.base import BaseLLMProvider, Message
 
+# Seconds a successful availability check is trusted before Ollama is asked again
+AVAILABILITY_TTL = 30.0
+
 
 class OllamaLLMProvider(BaseLLMProvider):
     """LLM provider using local Ollama models."""
@@ -13,6 +17,8 @@ class OllamaLLMProvider(BaseLLMProvider):
     def __init__(self, model: str = "llama3.1:8b"):
         self._model = model
         self._ollama = None
+        # time.monotonic() of the last successful availability check
+        self._available_at: Optional[float] = None
 
     def _get_ollama(self):
         """Lazy-load ollama module."""
@@ -38,30 +44,43 @@ class OllamaLLMProvider(BaseLLMProvider):
         message_dicts = self._messages_to_dicts(messages)
 
         if stream:
-            return self._stream_response(message_dicts)
+            return self._stream_response(ollama, message_dicts)
         else:
             response = ollama.chat(model=self._model, messages=message_dicts)
             return response["message"]["content"]
 
-    def _stream_response(self, messages: List[dict]) -> Generator[str, None, None]:
+    def _stream_response(self, ollama, messages: List[dict]) -> Generator[str, None, None]:
         """Stream response chunks from Ollama."""
-        ollama = self._get_ollama()
         stream = ollama.chat(model=self._model, messages=messages, stream=True)
 
         for chunk in stream:
-            if "message" in chunk and "content" in chunk["message"]:
-                yield chunk["message"]["content"]
+            content = (chunk.get("message") or {}).get("content")
+            if content:
+                yield content
+
+    def warmup(self) -> None:
+        self._get_ollama()
 
     def is_available(self) -> bool:
-        """Check if Ollama is running and the model is available."""
+        """Check if Ollama is running and the model is available.
+
+        A positive result is trusted for AVAILABILITY_TTL seconds, so
+        repeated checks skip the ollama.list() roundtrip but still notice a
+        stopped server; failures are re-checked each call.
+        """
+        if self._available_at is not None and time.monotonic() - self._available_at < AVAILABILITY_TTL:
+            return True
         try:
             ollama = self._get_ollama()
             models_response = ollama.list()
             models = models_response.models
-            model_names = [m.model.split(":")[0] for m in models if m.model]
-            return self._model.split(":")[0] in model_names or len(models) > 0
+            model_names = {m.model.split(":")[0] for m in models if m.model}
+            available = self._model.split(":")[0] in model_names or len(models) > 0
         except Exception:
+            self._available_at = None
             return False
+        self._available_at = time.monotonic() if available else None
+        return available
 
     def list_models(self) -> List[str]:
         """List available Ollama models."""
@@ -6,7 +6,7 @@ from typing import Generator, List, Optional
 
 from backend.providers.llm.base import BaseLLMProvider, Message
 from backend.providers.config import is_proxy_mode_enabled
-from backend.providers.proxy_client import proxy_llm_chat
+from backend.providers.proxy_client import get_http_client, proxy_llm_chat
 
 
 OPENAI_MODELS = [
@@ -38,7 +38,7 @@ class OpenAILLMProvider(BaseLLMProvider):
         """Lazy-load OpenAI client."""
         if self._client is None:
             from openai import OpenAI
-            self._client = OpenAI(api_key=self._api_key)
+            self._client = OpenAI(api_key=self._api_key, http_client=get_http_client())
         return self._client
 
     @property
@@ -84,8 +84,14 @@ class OpenAILLMProvider(BaseLLMProvider):
         )
 
         for chunk in stream:
-            if chunk.choices and chunk.choices[0].delta.content:
-                yield chunk.choices[0].delta.content
+            if chunk.choices:
+                content = chunk.choices[0].delta.content
+                if content:
+                    yield content
+
+    def warmup(self) -> None:
+        if not is_proxy_mode_enabled():
+            self._get_client()
 
     def is_available(self) -> bool:
         """Check if API key is configured and valid."""
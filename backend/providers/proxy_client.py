@@ -6,19 +6,108 @@ where API keys are securely stored as secrets.
 
 from __future__ import annotations
 
+import asyncio
+import atexit
+import importlib.util
 import json
-from typing import Any, Generator, List, Optional
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Generator, Iterator, List, Optional
 
 import httpx
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
 from backend.providers.config import get_clerk_token, get_proxy_url
 
+# HTTP/2 needs the optional h2 package; fall back to HTTP/1.1 keep-alive without it
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Fail fast when the proxy is unreachable; read timeouts stay per request
+CONNECT_TIMEOUT = 5.0
+LLM_TIMEOUT = httpx.Timeout(120.0, connect=CONNECT_TIMEOUT)
+EMBEDDINGS_TIMEOUT = httpx.Timeout(300.0, connect=CONNECT_TIMEOUT)
+QUERY_TIMEOUT = httpx.Timeout(60.0, connect=CONNECT_TIMEOUT)
+
+# Large embedding requests are split into sub-batches sent concurrently
+PROXY_EMBED_BATCH_SIZE = 96
+PROXY_EMBED_CONCURRENCY = 8
+
+_client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
+# AsyncClient connections belong to the event loop that opened them, so there
+# is one client per loop, dropped together with its loop
+_async_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = weakref.WeakKeyDictionary()
+_async_clients_lock = threading.Lock()
+
 
 class ProxyError(Exception):
     """Error from proxy request."""
     pass
 
 
+def get_http_client() -> httpx.Client:
+    """
+    Get the shared, connection-pooling HTTP client.
+
+    Used for proxy requests and handed to SDK clients that accept an
+    httpx.Client (OpenAI), so concurrent batches reuse keep-alive sessions.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = httpx.Client(
+                    http2=_HTTP2_AVAILABLE,
+                    limits=httpx.Limits(
+                        max_keepalive_connections=32,
+                        max_connections=100,
+                        keepalive_expiry=30.0,
+                    ),
+                    timeout=QUERY_TIMEOUT,
+                )
+                atexit.register(_client.close)
+    return _client
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """
+    Get the pooled async HTTP client for the running event loop.
+
+    Each loop gets its own client, since connections cannot be shared
+    across loops; clients of other live loops are left untouched. Call
+    aclose_async_http_client before the loop shuts down to close its
+    connections.
+    """
+    loop = asyncio.get_running_loop()
+    with _async_clients_lock:
+        client = _async_clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                http2=_HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_keepalive_connections=PROXY_EMBED_CONCURRENCY,
+                    max_connections=32,
+                    keepalive_expiry=30.0,
+                ),
+                timeout=QUERY_TIMEOUT,
+            )
+            _async_clients[loop] = client
+    return client
+
+
+async def aclose_async_http_client() -> None:
+    """Close the running loop's async HTTP client, if one was created."""
+    with _async_clients_lock:
+        client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
 def _get_headers() -> dict[str, str]:
     """Get headers for proxy requests including Clerk auth token."""
     headers = {
@@ -58,32 +147,51 @@ def proxy_llm_chat(
     if stream:
         return _stream_llm_response(url, payload)
     else:
-        with httpx.Client(timeout=120.0) as client:
-            response = client.post(url, json=payload, headers=_get_headers())
-            if response.status_code != 200:
-                raise ProxyError(f"Proxy error: {response.text}")
-            data = response.json()
-            return data.get("content", "")
+        response = get_http_client().post(url, json=payload, headers=_get_headers(), timeout=LLM_TIMEOUT)
+        if response.status_code != 200:
+            raise ProxyError(f"Proxy error: {response.text}")
+        data = _json_loads(response.content)
+        return data.get("content", "")
+
+
+def _iter_sse_data(response: httpx.Response) -> Iterator[bytes]:
+    """Yield the payload of each "data: " line, framing raw bytes without decoding to str."""
+    buf = bytearray()
+    # No chunk_size: httpx would hold bytes back until a full chunk arrived
+    for chunk in response.iter_bytes():
+        buf += chunk
+        start = 0
+        while True:
+            end = buf.find(b"\n", start)
+            if end == -1:
+                break
+            line = bytes(buf[start:end]).rstrip(b"\r")
+            start = end + 1
+            if line.startswith(b"data: "):
+                yield line[6:]
+        del buf[:start]
+
+    line = bytes(buf).rstrip(b"\r")
+    if line.startswith(b"data: "):
+        yield line[6:]
 
 
 def _stream_llm_response(url: str, payload: dict) -> Generator[str, None, None]:
     """Stream LLM response chunks."""
-    with httpx.Client(timeout=120.0) as client:
-        with client.stream("POST", url, json=payload, headers=_get_headers()) as response:
-            if response.status_code != 200:
-                raise ProxyError(f"Proxy error: {response.status_code}")
-            for line in response.iter_lines():
-                if line.startswith("data: "):
-                    data_str = line[6:]
-                    if data_str == "[DONE]":
-                        break
-                    try:
-                        data = json.loads(data_str)
-                        content = data.get("content", "")
-                        if content:
-                            yield content
-                    except json.JSONDecodeError:
-                        continue
+    client = get_http_client()
+    with client.stream("POST", url, json=payload, headers=_get_headers(), timeout=LLM_TIMEOUT) as response:
+        if response.status_code != 200:
+            raise ProxyError(f"Proxy error: {response.status_code}")
+        for data_bytes in _iter_sse_data(response):
+            if data_bytes == b"[DONE]":
+                break
+            try:
+                data = _json_loads(data_bytes)
+                content = data.get("content", "")
+                if content:
+                    yield content
+            except json.JSONDecodeError:
+                continue
 
 
 def proxy_embeddings(
@@ -94,6 +202,9 @@ def proxy_embeddings(
 ) -> List[List[float]]:
     """Proxy embeddings request through Supabase Edge Function.
 
+    Requests larger than PROXY_EMBED_BATCH_SIZE texts are split and the
+    sub-batches sent concurrently over the pooled client.
+
     Args:
         texts: List of texts to embed
         model: Embedding model name
@@ -101,22 +212,116 @@ def proxy_embeddings(
         input_type: Type of input ('document' or 'query')
 
     Returns:
-        List of embedding vectors
+        List of embedding vectors, in input order
     """
     url = f"{get_proxy_url()}/embeddings"
-    payload = {
+    headers = _get_headers()
+    chunks = _chunk_texts(texts)
+
+    def post(chunk: List[str]) -> List[List[float]]:
+        response = get_http_client().post(
+            url,
+            json=_embeddings_payload(chunk, model, provider, input_type),
+            headers=headers,
+            timeout=EMBEDDINGS_TIMEOUT,
+        )
+        return _parse_embeddings(response)
+
+    if len(chunks) == 1:
+        return post(chunks[0])
+
+    with ThreadPoolExecutor(max_workers=min(PROXY_EMBED_CONCURRENCY, len(chunks))) as executor:
+        results = list(executor.map(post, chunks))
+    return [embedding for result in results for embedding in result]
+
+
+async def proxy_embeddings_async(
+    texts: List[str],
+    model: str,
+    provider: str = "openai",
+    input_type: str = "document",
+) -> List[List[float]]:
+    """Async proxy_embeddings: sub-batches are sent concurrently on the async client.
+
+    Args:
+        texts: List of texts to embed
+        model: Embedding model name
+        provider: Embedding provider ('openai', 'cohere', 'voyage')
+        input_type: Type of input ('document' or 'query')
+
+    Returns:
+        List of embedding vectors, in input order
+    """
+    url = f"{get_proxy_url()}/embeddings"
+    headers = _get_headers()
+    client = get_async_http_client()
+    semaphore = asyncio.Semaphore(PROXY_EMBED_CONCURRENCY)
+
+    async def post(chunk: List[str]) -> List[List[float]]:
+        async with semaphore:
+            response = await client.post(
+                url,
+                json=_embeddings_payload(chunk, model, provider, input_type),
+                headers=headers,
+                timeout=EMBEDDINGS_TIMEOUT,
+            )
+        return _parse_embeddings(response)
+
+    results = await asyncio.gather(*(post(chunk) for chunk in _chunk_texts(texts)))
+    return [embedding for result in results for embedding in result]
+
+
+def _chunk_texts(texts: List[str]) -> List[List[str]]:
+    if len(texts) <= PROXY_EMBED_BATCH_SIZE:
+        return [texts]
+    return [
+        texts[i:i + PROXY_EMBED_BATCH_SIZE]
+        for i in range(0, len(texts), PROXY_EMBED_BATCH_SIZE)
+    ]
+
+
+def _embeddings_payload(
+    texts: List[str], model: str, provider: str, input_type: str
+) -> dict:
+    return {
         "texts": texts,
         "model": model,
         "provider": provider,
         "input_type": input_type,
     }
 
-    with httpx.Client(timeout=300.0) as client:
-        response = client.post(url, json=payload, headers=_get_headers())
-        if response.status_code != 200:
-            raise ProxyError(f"Proxy error: {response.text}")
-        data = response.json()
-        return data.get("embeddings", [])
+
+def _parse_embeddings(response: httpx.Response) -> List[List[float]]:
+    if response.status_code != 200:
+        raise ProxyError(f"Proxy error: {response.text}")
+    data = _json_loads(response.content)
+    return data.get("embeddings", [])
+
+
+def proxy_embed_query(text: str, model: str, provider: str = "openai") -> List[float]:
+    """Embed a single search query through the proxy.
+
+    Args:
+        text: Query text to embed
+        model: Embedding model name
+        provider: Embedding provider ('openai', 'cohere', 'voyage')
+
+    Returns:
+        Embedding vector, or an empty list if the proxy returned none
+    """
+    url = f"{get_proxy_url()}/embeddings"
+    payload = {
+        "texts": [text],
+        "model": model,
+        "provider": provider,
+        "input_type": "query",
+    }
+
+    response = get_http_client().post(url, json=payload, headers=_get_headers(), timeout=QUERY_TIMEOUT)
+    if response.status_code != 200:
+        raise ProxyError(f"Proxy error: {response.text}")
+    embeddings = _json_loads(response.content).get("embeddings")
+    return embeddings[0] if embeddings else []
 
 
 def proxy_rerank(
@@ -144,9 +349,8 @@ def proxy_rerank(
         "top_n": top_n,
     }
 
-    with httpx.Client(timeout=60.0) as client:
-        response = client.post(url, json=payload, headers=_get_headers())
-        if response.status_code != 200:
-            raise ProxyError(f"Proxy error: {response.text}")
-        data = response.json()
-        return data.get("results", [])
+    response = get_http_client().post(url, json=payload, headers=_get_headers(), timeout=QUERY_TIMEOUT)
+    if response.status_code != 200:
+        raise ProxyError(f"Proxy error: {response.text}")
+    data = _json_loads(response.content)
+    return data.get("results", [])
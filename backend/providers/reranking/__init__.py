@@ -1,16 +1,24 @@
 """Reranking provider implementations."""
 
-from backend.providers.reranking.base import BaseRerankingProvider, RerankResult
-from backend.providers.reranking.cohere import CohereRerankingProvider
-from backend.providers.reranking.cross_encoder import CrossEncoderRerankingProvider
-from backend.providers.reranking.llm_reranker import LLMRerankingProvider
-from backend.providers.reranking.none import NoopRerankingProvider
+import importlib
 
-__all__ = [
-    "BaseRerankingProvider",
-    "RerankResult",
-    "CohereRerankingProvider",
-    "CrossEncoderRerankingProvider",
-    "LLMRerankingProvider",
-    "NoopRerankingProvider",
-]
+_LAZY_IMPORTS = {
+    "BaseRerankingProvider": "backend.providers.reranking.base",
+    "RerankResult": "backend.providers.reranking.base",
+    "CohereRerankingProvider": "backend.providers.reranking.cohere",
+    "CrossEncoderRerankingProvider": "backend.providers.reranking.cross_encoder",
+    "LLMRerankingProvider": "backend.providers.reranking.llm_reranker",
+    "NoopRerankingProvider": "backend.providers.reranking.none",
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name: str):
+    """Import exported names on first access (PEP 562)."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
@@ -6,6 +6,8 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from typing import Any, Dict, List
 
+import numpy as np
+
 
 @dataclass
 class RerankResult:
@@ -17,6 +19,46 @@ class RerankResult:
     original_index: int
 
 
+def result_metadata(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Everything in a document except its text, for RerankResult.metadata."""
+    metadata = doc.copy()
+    metadata.pop("text", None)
+    return metadata
+
+
+def single_document_results(documents: List[Dict[str, Any]], top_n: int) -> List[RerankResult]:
+    """Results for at most one document, where there is nothing to rank: score 1.0, no model call."""
+    return [
+        RerankResult(
+            text=doc.get("text", ""),
+            score=1.0,
+            metadata=result_metadata(doc),
+            original_index=i,
+        )
+        for i, doc in enumerate(documents[:max(top_n, 0)])
+    ]
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, best first.
+
+    Partitions in O(n) and sorts only the k winners. Ties keep input order,
+    matching a stable descending sort of all n scores.
+    """
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k < len(scores):
+        kth = scores[np.argpartition(-scores, k - 1)[k - 1]]
+        above = np.flatnonzero(scores > kth)
+        ties = np.flatnonzero(scores == kth)[:k - len(above)]
+        top = np.concatenate((above, ties))
+    else:
+        top = np.arange(k)
+    return top[np.lexsort((top, -scores[top]))]
+
+
 class BaseRerankingProvider(ABC):
     """Abstract base class for reranking providers."""
 
@@ -46,6 +88,10 @@ class BaseRerankingProvider(ABC):
         """
         pass
 
+    def warmup(self) -> None:
+        """Import the SDK and build the client ahead of the first request. No-op by default."""
+        pass
+
     @abstractmethod
     def is_available(self) -> bool:
         """Check if the provider is available and configured."""
@@ -4,7 +4,12 @@ from __future__ import annotations
 
 from typing import Any, Dict, List
 
-from backend.providers.reranking.base import BaseRerankingProvider, RerankResult
+from backend.providers.reranking.base import (
+    BaseRerankingProvider,
+    RerankResult,
+    result_metadata,
+    single_document_results,
+)
 from backend.providers.config import is_proxy_mode_enabled
 from backend.providers.proxy_client import proxy_rerank
 
@@ -43,8 +48,8 @@ class CohereRerankingProvider(BaseRerankingProvider):
         documents: List[Dict[str, Any]],
         top_n: int = 10,
     ) -> List[RerankResult]:
-        if not documents:
-            return []
+        if len(documents) <= 1:
+            return single_document_results(documents, top_n)
 
         texts = [doc.get("text", "") for doc in documents]
 
@@ -62,7 +67,7 @@ class CohereRerankingProvider(BaseRerankingProvider):
                 results.append(RerankResult(
                     text=original_doc.get("text", ""),
                     score=item.get("relevance_score", 0.0),
-                    metadata={k: v for k, v in original_doc.items() if k != "text"},
+                    metadata=result_metadata(original_doc),
                     original_index=idx,
                 ))
             return results
@@ -82,12 +87,16 @@ class CohereRerankingProvider(BaseRerankingProvider):
             results.append(RerankResult(
                 text=original_doc.get("text", ""),
                 score=item.relevance_score,
-                metadata={k: v for k, v in original_doc.items() if k != "text"},
+                metadata=result_metadata(original_doc),
                 original_index=item.index,
             ))
 
         return results
 
+    def warmup(self) -> None:
+        if not is_proxy_mode_enabled():
+            self._get_client()
+
     def is_available(self) -> bool:
         """Check if API key is configured."""
         return bool(self._api_key)
@@ -2,25 +2,157 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
-
-from backend.providers.reranking.base import BaseRerankingProvider, RerankResult
+import importlib.util
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from backend.providers.reranking.base import (
+    BaseRerankingProvider,
+    RerankResult,
+    top_k_indices,
+    result_metadata,
+    single_document_results,
+)
+
+MAX_SEQ_LENGTH = 512
+_QUANTIZED_FILE = "model_quantized.onnx"
+
+# Loaded models by name, shared by every provider instance in the process
+_models: Dict[str, Any] = {}
+_models_lock = threading.Lock()
+
+
+class _OnnxCrossEncoder:
+    """
+    Int8 ONNX export of a cross-encoder, run directly on ONNX Runtime.
+
+    Exposes the subset of sentence_transformers.CrossEncoder.predict that
+    the provider uses. Scores are the raw logits, as CrossEncoder returns
+    for single-label ms-marco models.
+    """
+
+    def __init__(self, model_dir: Path):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        self._session = ort.InferenceSession(
+            str(model_dir / _QUANTIZED_FILE),
+            providers=["CPUExecutionProvider"],
+        )
+        self._input_names = {i.name for i in self._session.get_inputs()}
+        self._tokenizer = Tokenizer.from_file(str(model_dir / "tokenizer.json"))
+        self._tokenizer.enable_truncation(MAX_SEQ_LENGTH)
+        self._tokenizer.enable_padding()
+
+    @classmethod
+    def load(cls, model_name: str, model_dir: Path) -> "_OnnxCrossEncoder":
+        """Load the quantized model, exporting and quantizing it on first use."""
+        if not (model_dir / _QUANTIZED_FILE).exists():
+            cls._export(model_name, model_dir)
+        return cls(model_dir)
+
+    @staticmethod
+    def _export(model_name: str, model_dir: Path) -> None:
+        from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        from transformers import AutoTokenizer
+
+        model_dir.mkdir(parents=True, exist_ok=True)
+        model = ORTModelForSequenceClassification.from_pretrained(model_name, export=True)
+        model.save_pretrained(model_dir)
+        AutoTokenizer.from_pretrained(model_name).save_pretrained(model_dir)
+
+        # Dynamic quantization: int8 weights, activations quantized at run time
+        quantizer = ORTQuantizer.from_pretrained(model_dir)
+        quantizer.quantize(
+            save_dir=model_dir,
+            quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False),
+        )
+
+    def predict(
+        self,
+        pairs: Sequence[Tuple[str, str]],
+        batch_size: int = 32,
+        show_progress_bar: bool = False,
+        convert_to_numpy: bool = True,
+    ) -> np.ndarray:
+        scores = np.empty(len(pairs), dtype=np.float32)
+        for i in range(0, len(pairs), batch_size):
+            encodings = self._tokenizer.encode_batch(list(pairs[i:i + batch_size]))
+            inputs = {
+                "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+                "attention_mask": np.array([e.attention_mask for e in encodings], dtype=np.int64),
+                "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64),
+            }
+            logits = self._session.run(
+                None, {name: v for name, v in inputs.items() if name in self._input_names}
+            )[0]
+            scores[i:i + len(encodings)] = logits[:, 0]
+        return scores
+
+
+def _onnx_export_available() -> bool:
+    return all(
+        importlib.util.find_spec(name) is not None
+        for name in ("onnxruntime", "tokenizers", "optimum")
+    )
 
 
 class CrossEncoderRerankingProvider(BaseRerankingProvider):
-    """Reranking provider using local cross-encoder model."""
+    """
+    Reranking provider using local cross-encoder model.
+
+    When optimum is installed the model is exported to ONNX and dynamically
+    quantized to int8 once (cached under cross_encoder_int8/ in the data
+    dir), then scored on ONNX Runtime. Otherwise, or if the export fails,
+    the sentence-transformers FP32 model is used.
+    """
 
     def __init__(self, model: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"):
         self._model_name = model
         self._model = None
 
     def _get_model(self):
-        """Lazy-load cross-encoder model."""
+        """Lazy-load the process-wide model for this name, preferring the int8 ONNX build."""
         if self._model is None:
-            from sentence_transformers import CrossEncoder
-            self._model = CrossEncoder(self._model_name)
+            model = _models.get(self._model_name)
+            if model is None:
+                with _models_lock:
+                    model = _models.get(self._model_name)
+                    if model is None:
+                        model = self._load_model()
+                        _models[self._model_name] = model
+            self._model = model
         return self._model
 
+    def _load_model(self):
+        model = self._load_onnx_model()
+        if model is None:
+            from sentence_transformers import CrossEncoder
+            # Picks CUDA when available
+            model = CrossEncoder(self._model_name)
+        # Run once so lazy initialization (kernel selection, CUDA setup) happens now,
+        # not on the first user query
+        model.predict([("warm", "up")], batch_size=1, show_progress_bar=False, convert_to_numpy=True)
+        return model
+
+    def _load_onnx_model(self):
+        model_dir = self._onnx_dir()
+        if not (model_dir / _QUANTIZED_FILE).exists() and not _onnx_export_available():
+            return None
+        try:
+            return _OnnxCrossEncoder.load(self._model_name, model_dir)
+        except Exception as e:
+            print(f"Warning: Could not load int8 ONNX cross-encoder, using sentence-transformers: {e}")
+            return None
+
+    def _onnx_dir(self) -> Path:
+        from backend.db.metadata_store import get_data_dir
+        return get_data_dir() / "cross_encoder_int8" / self._model_name.replace("/", "--")
+
     @property
     def name(self) -> str:
         return "cross_encoder"
@@ -31,36 +163,43 @@ class CrossEncoderRerankingProvider(BaseRerankingProvider):
         documents: List[Dict[str, Any]],
         top_n: int = 10,
     ) -> List[RerankResult]:
-        if not documents:
-            return []
+        if len(documents) <= 1:
+            return single_document_results(documents, top_n)
 
         model = self._get_model()
 
         pairs = [(query, doc.get("text", "")) for doc in documents]
 
-        batch_size = 32
-        all_scores = []
-        for i in range(0, len(pairs), batch_size):
-            batch = pairs[i:i + batch_size]
-            scores = model.predict(batch)
-            all_scores.extend(scores)
+        # Sorted by length, so predict's consecutive batches pad to similar lengths
+        order = np.argsort([len(text) for _, text in pairs], kind="stable")
 
-        scored_docs = list(zip(documents, all_scores, range(len(documents))))
-        scored_docs.sort(key=lambda x: x[1], reverse=True)
+        scores = np.empty(len(pairs), dtype=np.float32)
+        scores[order] = model.predict(
+            [pairs[j] for j in order],
+            batch_size=32,
+            show_progress_bar=False,
+            convert_to_numpy=True,
+        )
 
         results = []
-        for doc, score, orig_idx in scored_docs[:top_n]:
+        for orig_idx in top_k_indices(scores, top_n).tolist():
+            doc = documents[orig_idx]
             results.append(RerankResult(
                 text=doc.get("text", ""),
-                score=float(score),
-                metadata={k: v for k, v in doc.items() if k != "text"},
+                score=float(scores[orig_idx]),
+                metadata=result_metadata(doc),
                 original_index=orig_idx,
             ))
 
         return results
 
+    def warmup(self) -> None:
+        self._get_model()
+
     def is_available(self) -> bool:
-        """Check if sentence-transformers is available."""
+        """Check if sentence-transformers or the ONNX export toolchain is available."""
+        if _onnx_export_available():
+            return True
         try:
             from sentence_transformers import CrossEncoder
             return True
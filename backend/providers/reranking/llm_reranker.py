@@ -2,11 +2,22 @@
 
 from __future__ import annotations
 
-import json
+import hashlib
 import re
-from typing import Any, Dict, List, TYPE_CHECKING
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
 
-from backend.providers.reranking.base import BaseRerankingProvider, RerankResult
+import numpy as np
+
+from backend.providers.cache import normalize_query
+from backend.providers.reranking.base import (
+    BaseRerankingProvider,
+    RerankResult,
+    top_k_indices,
+    result_metadata,
+    single_document_results,
+)
 
 if TYPE_CHECKING:
     from backend.providers.llm.base import BaseLLMProvider
@@ -23,12 +34,25 @@ Documents:
 Return ONLY a JSON array of scores in order, like: [8, 3, 7, 5, ...]
 Do not include any other text, just the JSON array."""
 
+SCORE_CACHE_CAPACITY = 1024
+
+# First bracketed list of numbers in the reply; trailing commas are tolerated
+_SCORES_RE = re.compile(r"\[([\d\s,\.]+)\]")
+
 
 class LLMRerankingProvider(BaseRerankingProvider):
-    """Reranking provider using an LLM to score document relevance."""
+    """
+    Reranking provider using an LLM to score document relevance.
+
+    Scores are cached per (normalized query, documents as sent in the
+    prompt), so repeating a search over the same candidates skips the LLM
+    call.
+    """
 
     def __init__(self, llm_provider: "BaseLLMProvider"):
         self._llm = llm_provider
+        self._score_cache: OrderedDict[str, List[float]] = OrderedDict()
+        self._score_cache_lock = threading.Lock()
 
     @property
     def name(self) -> str:
@@ -40,8 +64,8 @@ class LLMRerankingProvider(BaseRerankingProvider):
         documents: List[Dict[str, Any]],
         top_n: int = 10,
     ) -> List[RerankResult]:
-        if not documents:
-            return []
+        if len(documents) <= 1:
+            return single_document_results(documents, top_n)
 
         max_docs = 20
         docs_to_rank = documents[:max_docs]
@@ -51,39 +75,65 @@ class LLMRerankingProvider(BaseRerankingProvider):
             for i, doc in enumerate(docs_to_rank)
         )
 
-        prompt = LLM_RERANK_PROMPT.format(query=query, documents=doc_text)
-
-        from backend.providers.llm.base import Message
-        response = self._llm.generate([Message(role="user", content=prompt)])
+        cache_key = self._cache_key(query, doc_text)
+        scores = self._cached_scores(cache_key)
+        if scores is None:
+            prompt = LLM_RERANK_PROMPT.format(query=query, documents=doc_text)
 
-        scores = self._parse_scores(response, len(docs_to_rank))
+            from backend.providers.llm.base import Message
+            response = self._llm.generate([Message(role="user", content=prompt)])
 
-        scored_docs = list(zip(docs_to_rank, scores, range(len(docs_to_rank))))
-        scored_docs.sort(key=lambda x: x[1], reverse=True)
+            scores = self._parse_scores(response, len(docs_to_rank))
+            if scores is None:
+                # Unparseable reply: neutral scores, not cached so the next call retries
+                scores = [5.0] * len(docs_to_rank)
+            else:
+                self._store_scores(cache_key, scores)
 
         results = []
-        for doc, score, orig_idx in scored_docs[:top_n]:
+        for orig_idx in top_k_indices(np.asarray(scores), top_n).tolist():
+            doc = docs_to_rank[orig_idx]
             results.append(RerankResult(
                 text=doc.get("text", ""),
-                score=score / 10.0,
-                metadata={k: v for k, v in doc.items() if k != "text"},
+                score=scores[orig_idx] / 10.0,
+                metadata=result_metadata(doc),
                 original_index=orig_idx,
             ))
 
         return results
 
-    def _parse_scores(self, response: str, expected_count: int) -> List[float]:
-        """Parse scores from LLM response."""
+    def _cache_key(self, query: str, doc_text: str) -> str:
+        digest = hashlib.sha256(normalize_query(query).encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(doc_text.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _cached_scores(self, key: str) -> Optional[List[float]]:
+        with self._score_cache_lock:
+            scores = self._score_cache.get(key)
+            if scores is not None:
+                self._score_cache.move_to_end(key)
+            return scores
+
+    def _store_scores(self, key: str, scores: List[float]) -> None:
+        with self._score_cache_lock:
+            self._score_cache[key] = scores
+            if len(self._score_cache) > SCORE_CACHE_CAPACITY:
+                self._score_cache.popitem(last=False)
+
+    def _parse_scores(self, response: str, expected_count: int) -> Optional[List[float]]:
+        """Parse scores from LLM response; None if it has no usable score array."""
+        match = _SCORES_RE.search(response)
+        if match is None:
+            return None
         try:
-            json_match = re.search(r'\[[\d\s,\.]+\]', response)
-            if json_match:
-                scores = json.loads(json_match.group())
-                if len(scores) >= expected_count:
-                    return [float(s) for s in scores[:expected_count]]
-        except (json.JSONDecodeError, ValueError):
-            pass
-
-        return [5.0] * expected_count
+            scores = [float(s) for s in match.group(1).split(",") if s.strip()]
+        except ValueError:
+            return None
+        return scores[:expected_count] if len(scores) >= expected_count else None
+
+    def warmup(self) -> None:
+        self._llm.warmup()
 
     def is_available(self) -> bool:
         """Check if the underlying LLM is available."""
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from typing import Any, Dict, List
 
-from backend.providers.reranking.base import BaseRerankingProvider, RerankResult
+from backend.providers.reranking.base import BaseRerankingProvider, RerankResult, result_metadata
 
 
 class NoopRerankingProvider(BaseRerankingProvider):
@@ -26,7 +26,7 @@ class NoopRerankingProvider(BaseRerankingProvider):
             results.append(RerankResult(
                 text=doc.get("text", ""),
                 score=doc.get("relevance_score", 1.0 - i * 0.01),
-                metadata={k: v for k, v in doc.items() if k != "text"},
+                metadata=result_metadata(doc),
                 original_index=i,
             ))
         return results
@@ -0,0 +1,200 @@
+"""Semantic cache that reuses results for near-duplicate queries."""
+
+from __future__ import annotations
+
+import atexit
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from backend.providers.cache import normalize_query
+
+
+SIMILARITY_THRESHOLD = 0.97
+DEFAULT_CAPACITY = 4096
+# Rows allocated up front; the matrix doubles as entries are added, up to capacity
+_INITIAL_ROWS = 64
+
+
+class SemanticCache:
+    """
+    In-memory cache keyed by query embedding.
+
+    A lookup is a hit when a stored query's cosine similarity to the new
+    query is at least the threshold and both were made in the same scope.
+    The scope string should capture everything the cached value depends on
+    besides the query (corpus size, models, result count, ...), so that a
+    changed corpus or config never serves stale results. Least recently
+    used entries are evicted once capacity is reached. The embedding
+    matrix grows by doubling, so a mostly empty cache stays small.
+
+    Queries whose normalized text matches a stored one exactly can be
+    served by lookup_exact without embedding them first.
+    """
+
+    def __init__(
+        self,
+        threshold: float = SIMILARITY_THRESHOLD,
+        capacity: int = DEFAULT_CAPACITY,
+        persist_path: Optional[str] = None,
+    ):
+        self._threshold = threshold
+        self._capacity = capacity
+        self._persist_path = Path(persist_path) if persist_path else None
+        self._lock = threading.Lock()
+        self._clear()
+        self._load()
+
+    def _clear(self) -> None:
+        self._matrix: Optional[np.ndarray] = None
+        self._queries: List[str] = []
+        self._values: List[Any] = []
+        self._scopes: List[str] = []
+        self._last_used: List[int] = []
+        self._exact: Dict[Tuple[str, str], int] = {}
+        self._clock = 0
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> np.ndarray:
+        vec = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm > 0 else vec
+
+    def _allocate(self, rows: int, dim: int) -> np.ndarray:
+        rows = min(self._capacity, max(rows, _INITIAL_ROWS))
+        return np.empty((rows, dim), dtype=np.float32)
+
+    def lookup_exact(self, query: str, scope: str) -> Optional[Any]:
+        """Return the cached value for the same normalized query in this scope, or None."""
+        with self._lock:
+            idx = self._exact.get((normalize_query(query), scope))
+            if idx is None:
+                return None
+            self._clock += 1
+            self._last_used[idx] = self._clock
+            return self._values[idx]
+
+    def lookup(self, embedding: List[float], scope: str) -> Optional[Any]:
+        """Return the cached value for a similar query in this scope, or None."""
+        q = self._normalize(embedding)
+        with self._lock:
+            if self._matrix is None or self._matrix.shape[1] != q.shape[0]:
+                return None
+
+            sims = self._matrix[:len(self._values)] @ q
+            candidates = np.flatnonzero(sims >= self._threshold)
+            for idx in candidates[np.argsort(-sims[candidates])]:
+                if self._scopes[idx] == scope:
+                    self._clock += 1
+                    self._last_used[idx] = self._clock
+                    return self._values[idx]
+        return None
+
+    def add(self, query: str, embedding: List[float], value: Any, scope: str) -> None:
+        """Store a value for a query, evicting the least recently used entry if full."""
+        q = self._normalize(embedding)
+        with self._lock:
+            if self._matrix is None or self._matrix.shape[1] != q.shape[0]:
+                self._clear()
+                self._matrix = self._allocate(0, q.shape[0])
+
+            self._clock += 1
+            if len(self._values) < self._capacity:
+                idx = len(self._values)
+                if idx == self._matrix.shape[0]:
+                    grown = self._allocate(2 * idx, q.shape[0])
+                    grown[:idx] = self._matrix
+                    self._matrix = grown
+                self._queries.append(query)
+                self._values.append(value)
+                self._scopes.append(scope)
+                self._last_used.append(self._clock)
+            else:
+                idx = int(np.argmin(self._last_used))
+                self._exact.pop((normalize_query(self._queries[idx]), self._scopes[idx]), None)
+                self._queries[idx] = query
+                self._values[idx] = value
+                self._scopes[idx] = scope
+                self._last_used[idx] = self._clock
+            self._matrix[idx] = q
+            self._exact[(normalize_query(query), scope)] = idx
+
+    def clear(self) -> None:
+        """Drop every entry, including the persisted copy."""
+        with self._lock:
+            self._clear()
+            if self._persist_path is not None:
+                self._persist_path.unlink(missing_ok=True)
+
+    def save(self) -> None:
+        """Persist the cache to disk, if a persist path is configured."""
+        if self._persist_path is None:
+            return
+        with self._lock:
+            if not self._values:
+                return
+            n = len(self._values)
+            np.savez(
+                self._persist_path,
+                matrix=self._matrix[:n],
+                queries=np.array(self._queries),
+                scopes=np.array(self._scopes),
+                values=np.array([json.dumps(v, default=float) for v in self._values]),
+            )
+
+    def _load(self) -> None:
+        if self._persist_path is None or not self._persist_path.exists():
+            return
+        try:
+            with np.load(self._persist_path) as data:
+                matrix = data["matrix"]
+                queries = data["queries"].tolist()
+                scopes = data["scopes"].tolist()
+                values = [json.loads(v) for v in data["values"].tolist()]
+        except Exception as e:
+            print(f"Warning: Could not load semantic cache: {e}")
+            return
+
+        n = min(len(values), self._capacity)
+        self._matrix = self._allocate(n, matrix.shape[1])
+        self._matrix[:n] = matrix[:n]
+        self._queries = queries[:n]
+        self._scopes = scopes[:n]
+        self._values = values[:n]
+        self._last_used = list(range(n))
+        self._exact = {
+            (normalize_query(query), scope): i
+            for i, (query, scope) in enumerate(zip(self._queries, self._scopes))
+        }
+        self._clock = n
+
+
+_semantic_cache: Optional[SemanticCache] = None
+_semantic_cache_lock = threading.Lock()
+
+
+def get_semantic_cache() -> SemanticCache:
+    """Get or create the global semantic cache, saved to disk at exit."""
+    global _semantic_cache
+    if _semantic_cache is None:
+        with _semantic_cache_lock:
+            if _semantic_cache is None:
+                from backend.db.metadata_store import get_data_dir
+                cache = SemanticCache(persist_path=str(get_data_dir() / "semantic_cache.npz"))
+                atexit.register(cache.save)
+                _semantic_cache = cache
+    return _semantic_cache
+
+
+def invalidate_semantic_cache() -> None:
+    """Clear the global semantic cache; called whenever the indexed content changes."""
+    get_semantic_cache().clear()
+
+
+def reset_semantic_cache() -> None:
+    """Reset the global semantic cache."""
+    global _semantic_cache
+    _semantic_cache = None
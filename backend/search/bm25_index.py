@@ -2,40 +2,228 @@
 
 from __future__ import annotations
 
+import functools
+import json
+import math
+import os
 import pickle
 import re
 import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Collection, Dict, List, Optional, Sequence, Set, Tuple
 
-from rank_bm25 import BM25Okapi
+import numpy as np
+
+try:
+    from orjson import dumps as _json_dumps, loads as _json_loads
+except ImportError:
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+    _json_loads = json.loads
+
+from backend.providers.reranking.base import top_k_indices
+
+# Okapi BM25 parameters, matching rank_bm25.BM25Okapi's defaults
+K1 = 1.5
+B = 0.75
+EPSILON = 0.25
+
+_NON_WORD_RE = re.compile(r"[^\w\s]+")
+
+# Logged changes before the snapshot is rewritten in the background
+COMPACT_THRESHOLD = 5000
+
+# Recent (query, n_results) -> results, dropped whenever the index changes
+QUERY_CACHE_SIZE = 128
+
+
+def _file_path_of(doc_id: str) -> str:
+    """File path part of a chunk id ("<file_path>::slide<n>::chunk<i>")."""
+    return doc_id.rsplit("::slide", 1)[0]
+
+
+def _tokenize(text: str) -> List[str]:
+    """Tokenize text for BM25."""
+    return [t for t in _NON_WORD_RE.sub(" ", text.lower()).split() if len(t) >= 2]
+
+
+@functools.lru_cache(maxsize=256)
+def _tokenize_query(query: str) -> Tuple[str, ...]:
+    return tuple(_tokenize(query))
 
 
 class BM25Index:
-    """BM25 index for keyword-based document retrieval."""
+    """
+    BM25 index for keyword-based document retrieval.
+
+    Scores use the Okapi BM25 formula (as rank_bm25.BM25Okapi) over an
+    inverted index that is updated in place: adding or removing a document
+    touches only that document's terms, and a search walks only the
+    postings of the query terms. Terms are mapped to integer ids and each
+    document is kept as an int32 array of term ids (after a load, views
+    into one flat array) rather than a list of str.
+
+    Changes are appended to a log (log.jsonl) instead of rewriting the
+    whole index; once COMPACT_THRESHOLD changes accumulate, a background
+    thread folds them into a new snapshot. Loading reads the snapshot and
+    replays the log.
+    """
 
     _save_lock = threading.Lock()
 
     def __init__(self, persist_path: str = None):
+        """
+        Args:
+            persist_path: Directory holding the index files. Defaults to
+                bm25_index/ in the data dir. A legacy pickle at the same
+                path with a .pkl suffix is migrated on first load.
+        """
         if persist_path is None:
             from backend.db.metadata_store import get_data_dir
-            persist_path = str(get_data_dir() / "bm25_index.pkl")
+            persist_path = str(get_data_dir() / "bm25_index")
         self._persist_path = Path(persist_path)
-        self._persist_path.parent.mkdir(parents=True, exist_ok=True)
+        self._persist_path.mkdir(parents=True, exist_ok=True)
+        self._log_path = self._persist_path / "log.jsonl"
+        self._compacting_path = self._persist_path / "log.compacting.jsonl"
+
+        self._lock = threading.RLock()
+        self._log_records = 0
+        self._compacting = False
+        # Bumped by clear() so a compaction that copied older state never writes it
+        self._clear_generation = 0
 
-        self._documents: List[List[str]] = []
+        self._query_cache: OrderedDict[Tuple[str, int], List[Tuple[str, float]]] = OrderedDict()
+
+        self._documents: List[np.ndarray] = []
         self._doc_ids: List[str] = []
         self._doc_texts: List[str] = []
-        self._bm25: Optional[BM25Okapi] = None
+        self._id_to_idx: Dict[str, int] = {}
+        # file path -> ids of its chunks, for file-scoped searches
+        self._file_docs: Dict[str, Set[str]] = {}
+        self._reset_postings()
 
         self._load()
 
-    def _tokenize(self, text: str) -> List[str]:
-        """Tokenize text for BM25."""
-        text = text.lower()
-        text = re.sub(r'[^\w\s]', ' ', text)
-        tokens = text.split()
-        return [t for t in tokens if len(t) >= 2]
+    def _reset_postings(self) -> None:
+        # term -> term id, and term id -> term
+        self._vocab: Dict[str, int] = {}
+        self._terms: List[str] = []
+        # term id -> {doc index: term frequency}
+        self._postings: Dict[int, Dict[int, int]] = {}
+        self._doc_len: List[int] = []
+        self._total_len = 0
+        # Mean IDF over the vocabulary, used to floor negative IDFs; None when stale
+        self._average_idf: Optional[float] = None
+
+    def _term_ids(self, tokens: List[str]) -> np.ndarray:
+        """Map tokens to term ids, adding unseen terms to the vocabulary."""
+        vocab = self._vocab
+        for term in tokens:
+            if term not in vocab:
+                vocab[term] = len(self._terms)
+                self._terms.append(term)
+        return np.fromiter((vocab[t] for t in tokens), dtype=np.int32, count=len(tokens))
+
+    def _index_document(self, tokens: np.ndarray) -> None:
+        """Add postings for a document appended at the end of the lists."""
+        idx = len(self._doc_len)
+        terms, counts = np.unique(tokens, return_counts=True)
+        for term, tf in zip(terms.tolist(), counts.tolist()):
+            self._postings.setdefault(term, {})[idx] = tf
+        self._doc_len.append(len(tokens))
+        self._total_len += len(tokens)
+        self._average_idf = None
+
+    def _unindex_document(self, idx: int) -> None:
+        """
+        Drop the document at idx, moving the last document into its slot.
+
+        Only the postings of the two documents involved are touched.
+        """
+        last = len(self._doc_ids) - 1
+        removed_id = self._doc_ids[idx]
+        for term in set(self._documents[idx].tolist()):
+            posting = self._postings[term]
+            del posting[idx]
+            if not posting:
+                del self._postings[term]
+        self._total_len -= self._doc_len[idx]
+
+        if idx != last:
+            for term in set(self._documents[last].tolist()):
+                posting = self._postings[term]
+                posting[idx] = posting.pop(last)
+            self._documents[idx] = self._documents[last]
+            self._doc_ids[idx] = self._doc_ids[last]
+            self._doc_texts[idx] = self._doc_texts[last]
+            self._doc_len[idx] = self._doc_len[last]
+            self._id_to_idx[self._doc_ids[idx]] = idx
+
+        del self._id_to_idx[removed_id]
+        file_path = _file_path_of(removed_id)
+        file_docs = self._file_docs[file_path]
+        file_docs.discard(removed_id)
+        if not file_docs:
+            del self._file_docs[file_path]
+
+        self._documents.pop()
+        self._doc_ids.pop()
+        self._doc_texts.pop()
+        self._doc_len.pop()
+        self._average_idf = None
+
+    def _idf(self, df: int, n_docs: int) -> float:
+        idf = math.log(n_docs - df + 0.5) - math.log(df + 0.5)
+        if idf < 0:
+            if self._average_idf is None:
+                dfs = np.fromiter(
+                    (len(p) for p in self._postings.values()),
+                    dtype=np.float64,
+                    count=len(self._postings),
+                )
+                self._average_idf = float(np.mean(np.log(n_docs - dfs + 0.5) - np.log(dfs + 0.5)))
+            idf = EPSILON * self._average_idf
+        return idf
+
+    def _get_scores(self, query_tokens: Sequence[str]) -> np.ndarray:
+        """BM25 score of every document for the query tokens."""
+        n_docs = len(self._doc_len)
+        scores = np.zeros(n_docs)
+        doc_len = np.asarray(self._doc_len, dtype=np.float64)
+        avgdl = self._total_len / n_docs
+
+        for term in query_tokens:
+            posting = self._postings.get(self._vocab.get(term))
+            if not posting:
+                continue
+            idx = np.fromiter(posting.keys(), dtype=np.intp, count=len(posting))
+            tf = np.fromiter(posting.values(), dtype=np.float64, count=len(posting))
+            norm = K1 * (1 - B + B * doc_len[idx] / avgdl)
+            scores[idx] += self._idf(len(posting), n_docs) * (tf * (K1 + 1) / (tf + norm))
+        return scores
+
+    def _invalidate_queries(self) -> None:
+        self._query_cache.clear()
+
+    def _append_document(self, doc_id: str, text: str) -> None:
+        tokens = self._term_ids(_tokenize(text))
+        self._index_document(tokens)
+        self._id_to_idx[doc_id] = len(self._doc_ids)
+        self._file_docs.setdefault(_file_path_of(doc_id), set()).add(doc_id)
+        self._documents.append(tokens)
+        self._doc_ids.append(doc_id)
+        self._doc_texts.append(text)
+
+    def _remove_ids(self, ids_to_remove: List[str]) -> List[str]:
+        """Remove the given ids; returns the ids that were present."""
+        removed = []
+        for doc_id in ids_to_remove:
+            idx = self._id_to_idx.get(doc_id)
+            if idx is not None:
+                self._unindex_document(idx)
+                removed.append(doc_id)
+        return removed
 
     def add_documents(
         self,
@@ -43,113 +231,268 @@ class BM25Index:
         texts: List[str],
     ) -> None:
         """Add documents to the index."""
-        for doc_id, text in zip(doc_ids, texts):
-            if doc_id not in self._doc_ids:
-                tokenized = self._tokenize(text)
-                self._documents.append(tokenized)
-                self._doc_ids.append(doc_id)
-                self._doc_texts.append(text)
-
-        if self._documents:
-            self._bm25 = BM25Okapi(self._documents)
-        self._save()
+        with self._lock:
+            records = []
+            for doc_id, text in zip(doc_ids, texts):
+                if doc_id not in self._id_to_idx:
+                    self._append_document(doc_id, text)
+                    records.append({"add": doc_id, "text": text})
+            if records:
+                self._invalidate_queries()
+            self._append_log(records)
 
     def remove_documents(self, doc_ids: List[str]) -> None:
         """Remove documents from the index."""
-        ids_to_remove = set(doc_ids)
-        new_documents = []
-        new_doc_ids = []
-        new_doc_texts = []
-
-        for i, doc_id in enumerate(self._doc_ids):
-            if doc_id not in ids_to_remove:
-                new_documents.append(self._documents[i])
-                new_doc_ids.append(doc_id)
-                new_doc_texts.append(self._doc_texts[i])
-
-        self._documents = new_documents
-        self._doc_ids = new_doc_ids
-        self._doc_texts = new_doc_texts
-
-        if self._documents:
-            self._bm25 = BM25Okapi(self._documents)
-        else:
-            self._bm25 = None
-
-        self._save()
+        # Nothing to remove: return without taking the lock or touching the log
+        if not any(doc_id in self._id_to_idx for doc_id in doc_ids):
+            return
+        with self._lock:
+            removed = self._remove_ids(list(dict.fromkeys(doc_ids)))
+            if removed:
+                self._invalidate_queries()
+                self._append_log([{"remove": removed}])
 
     def search(
         self,
         query: str,
         n_results: int = 10,
+        file_paths: Optional[Collection[str]] = None,
     ) -> List[Tuple[str, float]]:
         """
         Search for documents matching the query.
 
+        Args:
+            query: Search query
+            n_results: Number of results to return
+            file_paths: If given, only chunks of these files are ranked
+
         Returns list of (doc_id, score) tuples sorted by score descending.
         """
-        if not self._bm25 or not self._documents:
+        if not self._documents:
             return []
 
-        tokenized_query = self._tokenize(query)
+        tokenized_query = _tokenize_query(query)
         if not tokenized_query:
             return []
 
-        scores = self._bm25.get_scores(tokenized_query)
-
-        scored_docs = list(zip(self._doc_ids, scores))
-        scored_docs.sort(key=lambda x: x[1], reverse=True)
-
-        return scored_docs[:n_results]
+        file_key = frozenset(file_paths) if file_paths is not None else None
+        key = (query, n_results, file_key)
+        # Postings and doc lists are changed in place, so score under the lock
+        with self._lock:
+            cached = self._query_cache.get(key)
+            if cached is not None:
+                self._query_cache.move_to_end(key)
+                return list(cached)
+            if not self._documents:
+                return []
+
+            scores = self._get_scores(tokenized_query)
+            if file_key is None:
+                top = top_k_indices(scores, n_results)
+            else:
+                candidates = np.array(
+                    sorted(self._id_to_idx[d] for fp in file_key for d in self._file_docs.get(fp, ())),
+                    dtype=np.intp,
+                )
+                top = candidates[top_k_indices(scores[candidates], n_results)]
+            results = [(self._doc_ids[i], scores[i]) for i in top.tolist()]
+
+            self._query_cache[key] = results
+            if len(self._query_cache) > QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+        return list(results)
 
     def get_document_text(self, doc_id: str) -> Optional[str]:
         """Get the original text for a document ID."""
-        try:
-            idx = self._doc_ids.index(doc_id)
-            return self._doc_texts[idx]
-        except ValueError:
-            return None
+        with self._lock:
+            idx = self._id_to_idx.get(doc_id)
+            return self._doc_texts[idx] if idx is not None else None
 
     def clear(self) -> None:
         """Clear all documents from the index."""
-        self._documents = []
-        self._doc_ids = []
-        self._doc_texts = []
-        self._bm25 = None
-        self._save()
+        with self._lock:
+            self._documents = []
+            self._doc_ids = []
+            self._doc_texts = []
+            self._id_to_idx = {}
+            self._file_docs = {}
+            self._reset_postings()
+            self._invalidate_queries()
+            self._clear_generation += 1
+            self._write_snapshot([], [], [], [])
+            self._log_path.unlink(missing_ok=True)
+            self._compacting_path.unlink(missing_ok=True)
+            self._log_records = 0
 
     def count(self) -> int:
         """Return the number of documents in the index."""
         return len(self._doc_ids)
 
-    def _save(self) -> None:
-        """Save the index to disk."""
+    def _append_log(self, records: List[dict]) -> None:
+        """Append change records to the log, compacting in the background when it grows."""
+        if not records:
+            return
+        with open(self._log_path, "ab") as f:
+            f.write(b"".join(_json_dumps(record) + b"\n" for record in records))
+        self._log_records += len(records)
+
+        if self._log_records >= COMPACT_THRESHOLD and not self._compacting:
+            self._compacting = True
+            threading.Thread(target=self._compact, name="bm25-compact", daemon=True).start()
+
+    def _compact(self) -> None:
+        """Write a fresh snapshot and drop the log entries it covers."""
+        try:
+            with self._lock:
+                documents = list(self._documents)
+                doc_ids = list(self._doc_ids)
+                doc_texts = list(self._doc_texts)
+                vocab = list(self._terms)
+                generation = self._clear_generation
+                if self._log_path.exists():
+                    os.replace(self._log_path, self._compacting_path)
+                self._log_records = 0
+            if self._write_snapshot(documents, doc_ids, doc_texts, vocab, generation):
+                self._compacting_path.unlink(missing_ok=True)
+        finally:
+            self._compacting = False
+
+    def _write_snapshot(
+        self,
+        documents: List[np.ndarray],
+        doc_ids: List[str],
+        doc_texts: List[str],
+        vocab: List[str],
+        generation: Optional[int] = None,
+    ) -> bool:
+        """
+        Write a full snapshot of the given documents.
+
+        Documents are written as a flat int32 array of term ids plus an
+        offsets array (both .npy) and one JSON file
+        with the ids, texts and vocabulary. The JSON is replaced last, so a
+        crash mid-save leaves a set that fails validation rather than a
+        mismatched one.
+
+        If generation is given and clear() has run since it was read, nothing
+        is written and False is returned. clear() bumps the generation before
+        taking the save lock, so its empty snapshot is always written last.
+        """
         with self._save_lock:
-            data = {
-                "documents": self._documents,
-                "doc_ids": self._doc_ids,
-                "doc_texts": self._doc_texts,
-            }
-            with open(self._persist_path, "wb") as f:
-                pickle.dump(data, f)
+            if generation is not None and generation != self._clear_generation:
+                return False
+            offsets = np.zeros(len(documents) + 1, dtype=np.int64)
+            np.cumsum([len(doc) for doc in documents], out=offsets[1:])
+            tokens = np.concatenate(documents) if documents else np.empty(0, dtype=np.int32)
+            self._write_atomic("tokens.npy", lambda f: np.save(f, tokens))
+            self._write_atomic("offsets.npy", lambda f: np.save(f, offsets))
+            meta = _json_dumps({
+                "doc_ids": doc_ids,
+                "doc_texts": doc_texts,
+                "vocab": vocab,
+            })
+            self._write_atomic("docs.json", lambda f: f.write(meta))
+        return True
+
+    def _write_atomic(self, name: str, write) -> None:
+        path = self._persist_path / name
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
 
     def _load(self) -> None:
-        """Load the index from disk."""
-        if not self._persist_path.exists():
+        """Load the snapshot (migrating a legacy pickle if present) and replay the log."""
+        if (self._persist_path / "docs.json").exists():
+            self._load_snapshot()
+        else:
+            self._migrate_pickle()
+
+        interrupted = self._compacting_path.exists()
+        if interrupted:
+            self._replay_log(self._compacting_path)
+        self._log_records = self._replay_log(self._log_path)
+
+        if interrupted:
+            # A compaction died mid-write; finish it now
+            self._write_snapshot(self._documents, self._doc_ids, self._doc_texts, self._terms)
+            self._log_path.unlink(missing_ok=True)
+            self._compacting_path.unlink(missing_ok=True)
+            self._log_records = 0
+
+    def _load_snapshot(self) -> None:
+        try:
+            with open(self._persist_path / "docs.json", "rb") as f:
+                meta = _json_loads(f.read())
+            # Read into memory rather than mmap: the files are replaced on compaction
+            tokens = np.load(self._persist_path / "tokens.npy")
+            offsets = np.load(self._persist_path / "offsets.npy")
+            doc_ids = meta["doc_ids"]
+            vocab = meta["vocab"]
+            if len(offsets) != len(doc_ids) + 1 or offsets[-1] != len(tokens):
+                raise ValueError("BM25 index files are out of sync")
+            if len(tokens) and int(tokens.max()) >= len(vocab):
+                raise ValueError("BM25 index refers to unknown terms")
+
+            bounds = offsets.tolist()
+            documents = [tokens[bounds[i]:bounds[i + 1]] for i in range(len(doc_ids))]
+        except Exception as e:
+            print(f"Warning: Could not load BM25 index: {e}")
             return
 
+        self._terms = vocab
+        self._vocab = {term: i for i, term in enumerate(vocab)}
+        self._documents = documents
+        self._doc_ids = doc_ids
+        self._doc_texts = meta["doc_texts"]
+        self._build_id_maps()
+        for tokens in self._documents:
+            self._index_document(tokens)
+
+    def _build_id_maps(self) -> None:
+        self._id_to_idx = {doc_id: i for i, doc_id in enumerate(self._doc_ids)}
+        self._file_docs = {}
+        for doc_id in self._doc_ids:
+            self._file_docs.setdefault(_file_path_of(doc_id), set()).add(doc_id)
+
+    def _replay_log(self, path: Path) -> int:
+        """Apply the change records in a log file; returns how many were read."""
+        if not path.exists():
+            return 0
+        count = 0
+        with open(path, "rb") as f:
+            for line in f:
+                try:
+                    record = _json_loads(line)
+                except ValueError:
+                    # Torn final line from a crash mid-append
+                    continue
+                count += 1
+                if "add" in record:
+                    if record["add"] not in self._id_to_idx:
+                        self._append_document(record["add"], record["text"])
+                elif "remove" in record:
+                    self._remove_ids(record["remove"])
+        return count
+
+    def _migrate_pickle(self) -> None:
+        legacy_path = self._persist_path.with_suffix(".pkl")
+        if not legacy_path.exists():
+            return
         try:
-            with open(self._persist_path, "rb") as f:
+            with open(legacy_path, "rb") as f:
                 data = pickle.load(f)
-
-            self._documents = data.get("documents", [])
-            self._doc_ids = data.get("doc_ids", [])
-            self._doc_texts = data.get("doc_texts", [])
-
-            if self._documents:
-                self._bm25 = BM25Okapi(self._documents)
         except Exception:
-            pass
+            return
+
+        self._documents = [self._term_ids(doc) for doc in data.get("documents", [])]
+        self._doc_ids = data.get("doc_ids", [])
+        self._doc_texts = data.get("doc_texts", [])
+        self._build_id_maps()
+        for tokens in self._documents:
+            self._index_document(tokens)
+        self._write_snapshot(self._documents, self._doc_ids, self._doc_texts, self._terms)
+        legacy_path.unlink()
 
 
 _bm25_index: Optional[BM25Index] = None
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import math
+import random
+import threading
+import time
+
+import numpy as np
+import pytest
+
+import backend.search.bm25_index as bm25_module
+from backend.search.bm25_index import BM25Index, _tokenize
+
+
+def _reference_scores(texts, query):
+    """Okapi BM25 computed from scratch, as rank_bm25.BM25Okapi does."""
+    corpus = [_tokenize(text) for text in texts]
+    n_docs = len(corpus)
+    avgdl = sum(len(doc) for doc in corpus) / n_docs
+    df = {}
+    for doc in corpus:
+        for term in set(doc):
+            df[term] = df.get(term, 0) + 1
+    idf = {term: math.log(n_docs - f + 0.5) - math.log(f + 0.5) for term, f in df.items()}
+    floor = bm25_module.EPSILON * (sum(idf.values()) / len(idf))
+    idf = {term: value if value >= 0 else floor for term, value in idf.items()}
+
+    scores = np.zeros(n_docs)
+    for term in _tokenize(query):
+        for i, doc in enumerate(corpus):
+            tf = doc.count(term)
+            norm = bm25_module.K1 * (1 - bm25_module.B + bm25_module.B * len(doc) / avgdl)
+            scores[i] += idf.get(term, 0) * tf * (bm25_module.K1 + 1) / (tf + norm)
+    return scores
+
+
+def _random_corpus(n_docs, seed=0):
+    rng = random.Random(seed)
+    words = [f"w{i}" for i in range(40)] + ["the", "and"] * 10
+    return {
+        f"/docs/file{i % 7}.pdf::slide{i}::chunk0": " ".join(
+            rng.choice(words) for _ in range(rng.randint(3, 30))
+        )
+        for i in range(n_docs)
+    }
+
+
+def _assert_matches_reference(index, texts, queries=("w1 the", "and w5 w5", "zzz w39", "the and")):
+    for query in queries:
+        expected = _reference_scores([texts[doc_id] for doc_id in index._doc_ids], query)
+        assert np.allclose(index._get_scores(_tokenize(query)), expected)
+
+
+@pytest.fixture
+def index(tmp_path):
+    return BM25Index(str(tmp_path / "bm25"))
+
+
+class TestScoreParity:
+    def test_scores_match_okapi_bm25(self, index):
+        texts = _random_corpus(120)
+        index.add_documents(list(texts), list(texts.values()))
+
+        _assert_matches_reference(index, texts)
+
+    def test_search_returns_best_scored_ids(self, index):
+        texts = _random_corpus(60)
+        index.add_documents(list(texts), list(texts.values()))
+
+        results = index.search("w3 w7", n_results=5)
+
+        expected = _reference_scores([texts[doc_id] for doc_id in index._doc_ids], "w3 w7")
+        assert [score for _, score in results] == pytest.approx(sorted(expected, reverse=True)[:5])
+
+    def test_search_scoped_to_files(self, index):
+        texts = _random_corpus(60)
+        index.add_documents(list(texts), list(texts.values()))
+
+        results = index.search("w3 w7 the", n_results=50, file_paths=["/docs/file2.pdf"])
+
+        assert results
+        assert all(doc_id.startswith("/docs/file2.pdf::") for doc_id, _ in results)
+
+
+class TestRemove:
+    def test_swap_remove_keeps_scores_and_ids_consistent(self, index):
+        texts = _random_corpus(80, seed=1)
+        index.add_documents(list(texts), list(texts.values()))
+
+        removed = random.Random(2).sample(list(texts), 30)
+        index.remove_documents(removed)
+        for doc_id in removed:
+            del texts[doc_id]
+
+        assert index.count() == len(texts)
+        assert {doc_id: i for i, doc_id in enumerate(index._doc_ids)} == index._id_to_idx
+        for doc_id, text in texts.items():
+            assert index.get_document_text(doc_id) == text
+        _assert_matches_reference(index, texts)
+
+    def test_removing_everything_empties_the_index(self, index):
+        texts = _random_corpus(10)
+        index.add_documents(list(texts), list(texts.values()))
+
+        index.remove_documents(list(texts))
+
+        assert index.count() == 0
+        assert index._postings == {}
+        assert index.search("w1") == []
+
+
+class TestPersistence:
+    def test_reload_replays_the_log(self, tmp_path):
+        path = str(tmp_path / "bm25")
+        index = BM25Index(path)
+        texts = _random_corpus(40)
+        index.add_documents(list(texts), list(texts.values()))
+        index.remove_documents(list(texts)[:10])
+
+        reloaded = BM25Index(path)
+
+        assert reloaded._doc_ids == index._doc_ids
+        assert reloaded.search("w1 the", 5) == index.search("w1 the", 5)
+
+    def test_compaction_writes_a_snapshot_and_drops_the_log(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(bm25_module, "COMPACT_THRESHOLD", 20)
+        path = str(tmp_path / "bm25")
+        index = BM25Index(path)
+        texts = _random_corpus(30)
+        index.add_documents(list(texts), list(texts.values()))
+
+        deadline = time.monotonic() + 5
+        while index._compacting and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert not index._compacting
+        assert not index._log_path.exists()
+        assert not index._compacting_path.exists()
+        reloaded = BM25Index(path)
+        assert reloaded._doc_ids == index._doc_ids
+        assert reloaded.search("w1 the", 5) == index.search("w1 the", 5)
+
+    def test_clear_during_compaction_is_not_undone(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(bm25_module, "COMPACT_THRESHOLD", 20)
+        path = str(tmp_path / "bm25")
+        index = BM25Index(path)
+
+        # Hold the compaction's snapshot write until clear() has finished
+        write_snapshot = index._write_snapshot
+        copied = threading.Event()
+        cleared = threading.Event()
+
+        def gated_write_snapshot(documents, doc_ids, doc_texts, vocab, generation=None):
+            if generation is not None:
+                copied.set()
+                cleared.wait(5)
+            return write_snapshot(documents, doc_ids, doc_texts, vocab, generation)
+
+        monkeypatch.setattr(index, "_write_snapshot", gated_write_snapshot)
+
+        texts = _random_corpus(30)
+        index.add_documents(list(texts), list(texts.values()))
+        assert copied.wait(5)
+        index.clear()
+        cleared.set()
+
+        deadline = time.monotonic() + 5
+        while index._compacting and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert not index._compacting
+        assert BM25Index(path).count() == 0
+
+    def test_clear_persists(self, tmp_path):
+        path = str(tmp_path / "bm25")
+        index = BM25Index(path)
+        texts = _random_corpus(10)
+        index.add_documents(list(texts), list(texts.values()))
+
+        index.clear()
+
+        assert BM25Index(path).count() == 0
+
+
+class TestConcurrency:
+    def test_search_during_add_and_remove(self, index):
+        texts = _random_corpus(3000, seed=3)
+        doc_ids = list(texts)
+        index.add_documents(doc_ids[:2000], [texts[d] for d in doc_ids[:2000]])
+
+        errors = []
+        done = threading.Event()
+
+        def search():
+            i = 0
+            while not done.is_set():
+                try:
+                    # A different query each time, so every search is scored rather than cached
+                    index.search(f"the w{i % 40} w{i % 37}", n_results=10)
+                except Exception as e:
+                    errors.append(e)
+                i += 1
+
+        def churn(ids):
+            for _ in range(2):
+                for doc_id in ids:
+                    index.add_documents([doc_id], [texts[doc_id]])
+                for doc_id in ids:
+                    index.remove_documents([doc_id])
+
+        searcher = threading.Thread(target=search)
+        writers = [
+            threading.Thread(target=churn, args=(doc_ids[2000:2500],)),
+            threading.Thread(target=churn, args=(doc_ids[2500:],)),
+        ]
+        try:
+            searcher.start()
+            for writer in writers:
+                writer.start()
+            for writer in writers:
+                writer.join()
+        finally:
+            done.set()
+            searcher.join()
+
+        assert errors == []
+        assert index.count() == 2000
+        _assert_matches_reference(index, texts)
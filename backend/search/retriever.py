@@ -2,15 +2,22 @@
 
 from __future__ import annotations
 
+import functools
+import itertools
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
 
+import numpy as np
+
 from backend.db.vector_store import get_vector_store, VectorStore
 from backend.indexer.embedder import generate_embedding
 from backend.providers import get_config, get_reranking_provider
 from backend.providers.config import get_scaled_initial_results
-from backend.providers.reranking.base import BaseRerankingProvider
+from backend.providers.reranking.base import BaseRerankingProvider, top_k_indices
+from backend.providers.semantic_cache import get_semantic_cache
 
 
 SECTION_KEYWORDS = {
@@ -23,10 +30,18 @@ SECTION_KEYWORDS = {
     "schedule": "Schedule",
 }
 
+_CAMEL_RE = re.compile(r"([a-z])([A-Z])")
+
+# BM25 queries share the index lock, so a couple of workers is enough
+BM25_SEARCH_WORKERS = 2
+_bm25_executor: Optional[ThreadPoolExecutor] = None
+_bm25_executor_lock = threading.Lock()
+
 
 def reciprocal_rank_fusion(
     ranked_lists: List[List[Tuple[str, float]]],
     k: int = 60,
+    top_n: Optional[int] = None,
 ) -> List[Tuple[str, float]]:
     """
     Combine multiple ranked lists using Reciprocal Rank Fusion.
@@ -36,37 +51,61 @@ def reciprocal_rank_fusion(
     Args:
         ranked_lists: List of ranked lists, each containing (doc_id, score) tuples
         k: RRF constant (default 60)
+        top_n: If set, return only the top_n best (selected without a full sort)
 
     Returns:
         Combined ranked list sorted by RRF score
     """
-    doc_scores: Dict[str, float] = {}
+    ranked_lists = [ranked_list for ranked_list in ranked_lists if ranked_list]
+    if not ranked_lists:
+        return []
 
-    for ranked_list in ranked_lists:
-        for rank, (doc_id, _) in enumerate(ranked_list, start=1):
-            if doc_id not in doc_scores:
-                doc_scores[doc_id] = 0.0
-            doc_scores[doc_id] += 1.0 / (k + rank)
+    # Intern ids to dense ints in first-appearance order
+    id_index: Dict[str, int] = {}
+    inverse = [
+        id_index.setdefault(doc_id, len(id_index))
+        for ranked_list in ranked_lists
+        for doc_id, _ in ranked_list
+    ]
+    ranks = np.concatenate([np.arange(1, len(ranked_list) + 1) for ranked_list in ranked_lists])
+    scores = np.bincount(inverse, weights=1.0 / (k + ranks), minlength=len(id_index))
 
-    sorted_docs = sorted(doc_scores.items(), key=lambda x: x[1], reverse=True)
-    return sorted_docs
+    # Ties keep the order they were first seen in
+    if top_n is None:
+        order = np.argsort(-scores, kind="stable")
+    else:
+        order = top_k_indices(scores, top_n)
+    unique_ids = list(id_index)
+    return [(unique_ids[i], score) for i, score in zip(order.tolist(), scores[order].tolist())]
 
 
-def normalize_scores(results: List[Tuple[str, float]]) -> List[Tuple[str, float]]:
-    """Min-max normalize scores to [0, 1] range."""
-    if not results:
-        return []
+def _get_bm25_executor() -> ThreadPoolExecutor:
+    """Shared worker pool that runs BM25 lookups alongside vector searches."""
+    global _bm25_executor
+    if _bm25_executor is None:
+        with _bm25_executor_lock:
+            if _bm25_executor is None:
+                _bm25_executor = ThreadPoolExecutor(
+                    max_workers=BM25_SEARCH_WORKERS, thread_name_prefix="bm25-search"
+                )
+    return _bm25_executor
 
-    scores = [s for _, s in results]
-    min_s, max_s = min(scores), max(scores)
 
-    if max_s == min_s:
-        return [(doc_id, 1.0) for doc_id, _ in results]
+def _bm25_search(
+    query: str,
+    n_results: int,
+    file_paths: Optional[List[str]] = None,
+) -> Optional[List[Tuple[str, float]]]:
+    """BM25 ranking for hybrid_search, or None when the index is unavailable or empty."""
+    try:
+        from backend.search.bm25_index import get_bm25_index
+    except ImportError:
+        return None
 
-    return [
-        (doc_id, (score - min_s) / (max_s - min_s))
-        for doc_id, score in results
-    ]
+    bm25_index = get_bm25_index()
+    if bm25_index.count() == 0:
+        return None
+    return bm25_index.search(query, n_results=n_results, file_paths=file_paths or None)
 
 
 def hybrid_search(
@@ -74,6 +113,7 @@ def hybrid_search(
     vector_store: VectorStore,
     n_results: int = 50,
     file_paths: Optional[List[str]] = None,
+    query_embedding: Optional[List[float]] = None,
 ) -> List[Dict]:
     """
     Hybrid search combining vector similarity and BM25.
@@ -83,13 +123,20 @@ def hybrid_search(
         vector_store: Vector store instance
         n_results: Number of results to return
         file_paths: Optional list of file paths to filter results
+        query_embedding: Optional precomputed embedding of the query
 
     Returns:
         List of search results with text and metadata
     """
     config = get_config()
 
-    query_embedding = generate_embedding(query)
+    # BM25 ranks on a worker thread while this thread embeds and queries the vector store
+    bm25_future = None
+    if config.hybrid_search_enabled:
+        bm25_future = _get_bm25_executor().submit(_bm25_search, query, n_results * 2, file_paths)
+
+    if query_embedding is None:
+        query_embedding = generate_embedding(query)
     if file_paths:
         vector_results = vector_store.search_with_filter(
             query_embedding,
@@ -101,37 +148,20 @@ def hybrid_search(
 
     vector_ranked = [(r["id"], 1 - r["distance"]) for r in vector_results]
 
-    if config.hybrid_search_enabled:
-        try:
-            from backend.search.bm25_index import get_bm25_index
-            bm25_index = get_bm25_index()
-
-            if bm25_index.count() > 0:
-                bm25_results = bm25_index.search(query, n_results=n_results * 2)
-
-                if file_paths:
-                    file_paths_set = set(file_paths)
-                    bm25_results = [
-                        (doc_id, score) for doc_id, score in bm25_results
-                        if any(fp in doc_id for fp in file_paths_set)
-                    ]
+    bm25_results = bm25_future.result() if bm25_future is not None else None
+    if bm25_results is not None:
+        # RRF reads only rank positions, so BM25 scores need no normalizing
+        fused = reciprocal_rank_fusion([vector_ranked, bm25_results], top_n=n_results)
 
-                bm25_ranked = normalize_scores(bm25_results)
+        top_ids = [doc_id for doc_id, _ in fused]
 
-                fused = reciprocal_rank_fusion([vector_ranked, bm25_ranked])
+        results_by_id = {r["id"]: r for r in vector_results}
+        final_results = []
+        for doc_id in top_ids:
+            if doc_id in results_by_id:
+                final_results.append(results_by_id[doc_id])
 
-                top_ids = [doc_id for doc_id, _ in fused[:n_results]]
-                id_to_rank = {doc_id: i for i, doc_id in enumerate(top_ids)}
-
-                results_by_id = {r["id"]: r for r in vector_results}
-                final_results = []
-                for doc_id in top_ids:
-                    if doc_id in results_by_id:
-                        final_results.append(results_by_id[doc_id])
-
-                return final_results
-        except ImportError:
-            pass
+        return final_results
 
     return vector_results[:n_results]
 
@@ -188,15 +218,21 @@ def rerank_results(
 def _extract_search_terms(query: str) -> List[str]:
     """Extract search terms from query, handling camelCase/PascalCase."""
     terms = []
+    seen = set()
     for word in query.split():
         if len(word) <= 2:
             continue
-        terms.append(word.lower())
-        camel_split = re.sub(r'([a-z])([A-Z])', r'\1 \2', word).split()
-        for t in camel_split:
+        word_lower = word.lower()
+        terms.append(word_lower)
+        seen.add(word_lower)
+        # Single-case words have no camelCase boundary to split on
+        if word.islower() or word.isupper():
+            continue
+        for t in _CAMEL_RE.sub(r"\1 \2", word).split():
             t_lower = t.lower()
-            if len(t_lower) >= 2 and t_lower not in terms:
+            if len(t_lower) >= 2 and t_lower not in seen:
                 terms.append(t_lower)
+                seen.add(t_lower)
     return terms
 
 
@@ -205,6 +241,12 @@ def _normalize_path(path: str) -> str:
     return path.lower().replace(" ", "").replace("-", "").replace("_", "")
 
 
+@functools.lru_cache(maxsize=16384)
+def _path_match_forms(path: str) -> Tuple[str, str]:
+    """(lowercased, normalized) forms of an indexed path, cached across queries."""
+    return path.lower(), _normalize_path(path)
+
+
 def search_files_by_name(
     query: str,
     vector_store: Optional[VectorStore] = None
@@ -220,8 +262,7 @@ def search_files_by_name(
 
     matches = []
     for file_path in all_files:
-        path_lower = file_path.lower()
-        path_normalized = _normalize_path(file_path)
+        path_lower, path_normalized = _path_match_forms(file_path)
         if any(term in path_lower or term in path_normalized for term in query_terms):
             matches.append({
                 "file_path": file_path,
@@ -273,17 +314,42 @@ def search_documents(
     chunk_count = vector_store.count()
     scaled_initial = get_scaled_initial_results(chunk_count, config.initial_results)
 
+    semantic_cache = get_semantic_cache()
+    scope = "|".join([
+        str(chunk_count),
+        config.embedding_model,
+        config.reranking_provider if use_reranking else "",
+        config.reranking_model if use_reranking else "",
+        str(config.hybrid_search_enabled),
+        str(scaled_initial),
+        str(n_results),
+        "\0".join(sorted(file_paths)) if file_paths else "",
+    ])
+    cached = semantic_cache.lookup_exact(query, scope)
+    if cached is not None:
+        return [dict(r) for r in cached]
+
+    query_embedding = generate_embedding(query)
+    cached = semantic_cache.lookup(query_embedding, scope)
+    if cached is not None:
+        return [dict(r) for r in cached]
+
     results = hybrid_search(
         query,
         vector_store,
         n_results=scaled_initial,
         file_paths=file_paths,
+        query_embedding=query_embedding,
     )
     formatted = _format_search_results(results)
 
     if use_reranking:
-        return rerank_results(query, formatted, top_n=n_results)
-    return formatted[:n_results]
+        final = rerank_results(query, formatted, top_n=n_results)
+    else:
+        final = formatted[:n_results]
+
+    semantic_cache.add(query, query_embedding, [dict(r) for r in final], scope)
+    return final
 
 
 def _merge_and_dedupe(
@@ -291,30 +357,26 @@ def _merge_and_dedupe(
     keyword_results: List[Dict]
 ) -> List[Dict]:
     """Merge results, prioritizing keyword matches first."""
-    seen_ids = set()
-    merged = []
+    # Keyed by (file_path, slide_number); insertion order is the merged order
+    merged: Dict[Tuple[str, int], Dict] = {}
 
     for r in keyword_results:
         file_path = r["metadata"]["file_path"]
         slide_number = r["metadata"]["slide_number"]
-        result_id = f"{file_path}::{slide_number}"
-        if result_id not in seen_ids:
-            seen_ids.add(result_id)
-            merged.append({
+        key = (file_path, slide_number)
+        if key not in merged:
+            merged[key] = {
                 "text": r["text"],
                 "file_path": file_path,
                 "file_name": Path(file_path).name,
                 "slide_number": slide_number,
                 "relevance_score": 1.0
-            })
+            }
 
     for r in semantic_results:
-        result_id = f"{r['file_path']}::{r['slide_number']}"
-        if result_id not in seen_ids:
-            seen_ids.add(result_id)
-            merged.append(r)
+        merged.setdefault((r['file_path'], r['slide_number']), r)
 
-    return merged
+    return list(merged.values())
 
 
 def _expand_to_adjacent_pages(
@@ -325,13 +387,15 @@ def _expand_to_adjacent_pages(
 ) -> List[Dict]:
     """Expand results to include adjacent pages from the same file."""
     expanded = list(results)
-    seen_ids = set()
+    seen_pages = set()
 
     for r in results:
         file_path = r.get('file_path') or r.get('metadata', {}).get('file_path')
         page_num = r.get('slide_number') or r.get('metadata', {}).get('slide_number', 0)
-        seen_ids.add(f"{file_path}::{page_num}")
+        seen_pages.add((file_path, page_num))
 
+    # Collect every missing adjacent page first so they can be fetched in one query
+    wanted: Dict[Tuple[str, int], None] = {}
     for r in results:
         file_path = r.get('file_path') or r.get('metadata', {}).get('file_path')
         if file_path not in relevant_files:
@@ -346,16 +410,22 @@ def _expand_to_adjacent_pages(
             if adjacent_page < 1:
                 continue
 
-            chunk_id = f"{file_path}::{adjacent_page}"
-            if chunk_id in seen_ids:
-                continue
+            page = (file_path, adjacent_page)
+            if page not in seen_pages:
+                wanted[page] = None
+
+    if not wanted:
+        return expanded
+
+    chunks_by_page = vector_store.get_chunks_by_files_and_pages(list(wanted))
 
-            adjacent_chunks = vector_store.get_chunks_by_file_and_page(file_path, adjacent_page)
-            for chunk in adjacent_chunks:
-                if chunk_id not in seen_ids:
-                    seen_ids.add(chunk_id)
-                    chunk['relevance_score'] = 0.9
-                    expanded.append(chunk)
+    for page in wanted:
+        adjacent_chunks = chunks_by_page.get(page)
+        if adjacent_chunks:
+            # One chunk per adjacent page
+            chunk = adjacent_chunks[0]
+            chunk['relevance_score'] = 0.9
+            expanded.append(chunk)
 
     return expanded
 
@@ -397,18 +467,16 @@ def get_context_and_sources_for_query(
     query_lower = query.lower()
     config = get_config()
 
-    matching_section_count = sum(1 for kw in SECTION_KEYWORDS if kw in query_lower)
-    if matching_section_count > 1:
-        n_results = max(n_results, matching_section_count * 5)
-
-    results = search_documents(query, vector_store, n_results=config.rerank_to, use_reranking=True, file_paths=file_paths)
-    relevant_files = {r['file_path'] for r in results}
-
     matching_keywords = [
         (keyword, search_term)
         for keyword, search_term in SECTION_KEYWORDS.items()
         if keyword in query_lower
     ]
+    if len(matching_keywords) > 1:
+        n_results = max(n_results, len(matching_keywords) * 5)
+
+    results = search_documents(query, vector_store, n_results=config.rerank_to, use_reranking=True, file_paths=file_paths)
+    relevant_files = {r['file_path'] for r in results}
 
     for keyword, search_term in matching_keywords:
         keyword_results = vector_store.search_by_text(search_term, limit=20)
@@ -423,19 +491,21 @@ def get_context_and_sources_for_query(
         results = _expand_to_adjacent_pages(results, vector_store, relevant_files)
 
     if 'inclusion' in query_lower and 'exclusion' not in query_lower:
-        results = [
-            r for r in results
-            if 'exclusion criteria' not in r.get('text', '').lower()
-            or 'inclusion criteria' in r.get('text', '').lower()
-        ]
+        wanted, unwanted = 'inclusion criteria', 'exclusion criteria'
     elif 'exclusion' in query_lower and 'inclusion' not in query_lower:
-        results = [
-            r for r in results
-            if 'inclusion criteria' not in r.get('text', '').lower()
-            or 'exclusion criteria' in r.get('text', '').lower()
-        ]
+        wanted, unwanted = 'exclusion criteria', 'inclusion criteria'
+    else:
+        wanted = unwanted = None
+
+    if unwanted is None:
+        results = results[:n_results]
+    else:
+        def keep(r: Dict) -> bool:
+            text_lower = r.get('text', '').lower()
+            return unwanted not in text_lower or wanted in text_lower
 
-    results = results[:n_results]
+        # Stop filtering once n_results rows are kept
+        results = list(itertools.islice(filter(keep, results), n_results))
 
     if not results:
         return "No relevant documents found.", []
@@ -26,8 +26,8 @@ class TestExpandToAdjacentPages:
         relevant_files = set()
 
         class MockVectorStore:
-            def get_chunks_by_file_and_page(self, file_path, page_number):
-                return []
+            def get_chunks_by_files_and_pages(self, pages):
+                return {}
 
         expanded = _expand_to_adjacent_pages(results, MockVectorStore(), relevant_files)
         assert len(expanded) == 1
@@ -39,9 +39,9 @@ class TestExpandToAdjacentPages:
         relevant_files = {"/path/file.pdf"}
 
         class MockVectorStore:
-            def get_chunks_by_file_and_page(self, file_path, page_number):
-                if page_number in [25, 26, 28, 29]:
-                    return [{
+            def get_chunks_by_files_and_pages(self, pages):
+                return {
+                    (file_path, page_number): [{
                         "id": f"{file_path}::slide{page_number}",
                         "text": f"page {page_number} content",
                         "metadata": {"file_path": file_path, "slide_number": page_number},
@@ -50,7 +50,9 @@ class TestExpandToAdjacentPages:
                         "slide_number": page_number,
                         "relevance_score": 1.0
                     }]
-                return []
+                    for file_path, page_number in pages
+                    if page_number in [25, 26, 28, 29]
+                }
 
         expanded = _expand_to_adjacent_pages(results, MockVectorStore(), relevant_files)
         assert len(expanded) == 5
@@ -65,18 +67,48 @@ class TestExpandToAdjacentPages:
         relevant_files = {"/path/file.pdf"}
 
         class MockVectorStore:
-            def get_chunks_by_file_and_page(self, file_path, page_number):
-                return [{
-                    "id": f"{file_path}::slide{page_number}",
-                    "text": f"page {page_number}",
-                    "metadata": {"file_path": file_path, "slide_number": page_number},
-                    "file_path": file_path,
-                    "file_name": "file.pdf",
-                    "slide_number": page_number,
-                    "relevance_score": 1.0
-                }]
+            def get_chunks_by_files_and_pages(self, pages):
+                return {
+                    (file_path, page_number): [{
+                        "id": f"{file_path}::slide{page_number}",
+                        "text": f"page {page_number}",
+                        "metadata": {"file_path": file_path, "slide_number": page_number},
+                        "file_path": file_path,
+                        "file_name": "file.pdf",
+                        "slide_number": page_number,
+                        "relevance_score": 1.0
+                    }]
+                    for file_path, page_number in pages
+                }
 
         expanded = _expand_to_adjacent_pages(results, MockVectorStore(), relevant_files)
         page_numbers = [r.get("slide_number") for r in expanded]
         assert page_numbers.count(26) == 1
         assert page_numbers.count(27) == 1
+
+    def test_fetches_adjacent_pages_in_one_batch(self):
+        results = [
+            {"file_path": "/path/file.pdf", "slide_number": 2, "text": "page 2"},
+        ]
+        relevant_files = {"/path/file.pdf"}
+        calls = []
+
+        class MockVectorStore:
+            def get_chunks_by_files_and_pages(self, pages):
+                calls.append(pages)
+                return {
+                    (file_path, page_number): [{
+                        "id": f"{file_path}::slide{page_number}",
+                        "text": f"page {page_number}",
+                        "file_path": file_path,
+                        "slide_number": page_number,
+                        "relevance_score": 1.0
+                    }]
+                    for file_path, page_number in pages
+                    if page_number != 4
+                }
+
+        expanded = _expand_to_adjacent_pages(results, MockVectorStore(), relevant_files)
+        assert calls == [[("/path/file.pdf", 1), ("/path/file.pdf", 3), ("/path/file.pdf", 4)]]
+        assert [r["slide_number"] for r in expanded] == [2, 1, 3]
+        assert all(r["relevance_score"] == 0.9 for r in expanded[1:])
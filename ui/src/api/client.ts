@@ -69,6 +69,7 @@ export interface SkippedFile {
   file_name: string;
   reason: string;
   chunks_would_be?: number;
+  chunk_limit?: number;
 }
 
 export interface SkippedByReason {
@@ -34,7 +34,7 @@ export function ProgressBar({ messages, isActive }: ProgressBarProps) {
         className="bg-gray-900 text-green-400 font-mono text-xs p-3 rounded-lg max-h-48 overflow-y-auto"
       >
         {messages.map((msg, i) => (
-          <div key={i} className="py-0.5">
+          <div key={i} className="py-0.5 whitespace-pre-line">
             {msg}
           </div>
         ))}
@@ -474,18 +474,22 @@ export function SettingsPanel({
                     <div key={i} className="flex justify-between text-xs">
                       <span className="truncate">{file.file_name}</span>
                       <span className="text-amber-600 ml-2 whitespace-nowrap">
-                        {file.chunks_would_be} chunks needed
+                        {file.chunks_would_be
+                          ? `${file.chunks_would_be} chunks needed`
+                          : `exceeds the current limit of ${file.chunk_limit}`}
                       </span>
                     </div>
                   ))}
                 </div>
                 <div className="mt-3 flex items-center justify-between">
                   <p className="text-xs text-amber-600">
-                    Set Max Chunks to{" "}
-                    {Math.max(
-                      ...stats.skipped_files.map((f) => f.chunks_would_be || 0),
-                    )}
-                    + to index all
+                    {stats.skipped_files.every((f) => f.chunks_would_be)
+                      ? `Set Max Chunks to at least ${Math.max(
+                          ...stats.skipped_files.map(
+                            (f) => f.chunks_would_be || 0,
+                          ),
+                        )} to index all`
+                      : "Raise Max Chunks above the current limit to index all"}
                   </p>
                   <button
                     onClick={handleIndexSkipped}